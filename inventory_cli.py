@@ -4,41 +4,239 @@ Inventory Management System - Command Line Interface
 A simple CLI for interacting with the inventory system.
 """
 
+import csv
 import os
+import re
 import sys
 import cmd
-import textwrap
+import shlex
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
-# Import the inventory system
-from inventory_system import (
-    InventorySystem, Product, InventoryTransaction,
-    logger
-)
+# The inventory system (which opens the database on construction) is
+# imported lazily inside InventoryCLI so invocations that never touch the
+# database -- help, exit, --help wrappers -- skip the connect cost entirely.
+
+# Precompiled row templates for the listing commands. Compiling the format
+# string once and reusing it avoids re-parsing the format spec for every row.
+CATEGORY_ROW_FMT = "{category_id:<5} {name:<30} {description:<40}"
+SUPPLIER_ROW_FMT = "{supplier_id:<5} {name:<30} {contact_person:<20} {email:<25}"
+LOCATION_ROW_FMT = "{location_id:<5} {name:<30} {description:<40}"
+PRODUCT_ROW_FMT = "{product_id:<5} {sku:<10} {name:<30} {category_name:<15} ${unit_price:<9.2f} {min_stock_level:<10}"
+INVENTORY_ROW_FMT = "{product_name:<30} {sku:<10} {location_name:<20} {quantity:<10}"
+LOW_STOCK_ROW_FMT = "{name:<30} {sku:<10} {category:<15} {total_quantity:<10} {min_stock_level:<10} {quantity_to_order:<10}"
+HISTORY_ROW_FMT = "{transaction_id:<5} {transaction_date:<20} {product_name:<25} {location_name:<15} {transaction_type:<12} {quantity:<5} {reference_number:<10}"
+SEARCH_ROW_FMT = "{product_id:<5} {sku:<10} {name:<30} {category_name:<15} ${unit_price:<9.2f}"
+
+# Static table decoration, built once instead of per listing call
+SEP_30 = "-" * 30
+SEP_40 = "-" * 40
+SEP_50 = "-" * 50
+SEP_60 = "-" * 60
+SEP_80 = "-" * 80
+SEP_90 = "-" * 90
+SEP_100 = "-" * 100
+
+CATEGORY_HEADER = f"{'ID':<5} {'Name':<30} {'Description':<40}"
+SUPPLIER_HEADER = f"{'ID':<5} {'Name':<30} {'Contact':<20} {'Email':<25}"
+LOCATION_HEADER = f"{'ID':<5} {'Name':<30} {'Description':<40}"
+PRODUCT_HEADER = f"{'ID':<5} {'SKU':<10} {'Name':<30} {'Category':<15} {'Price':<10} {'Min Stock':<10}"
+INVENTORY_HEADER = f"{'Product':<30} {'SKU':<10} {'Location':<20} {'Quantity':<10}"
+LOW_STOCK_HEADER = f"{'Product':<30} {'SKU':<10} {'Category':<15} {'Current':<10} {'Min':<10} {'To Order':<10}"
+HISTORY_HEADER = f"{'ID':<5} {'Date':<20} {'Product':<25} {'Location':<15} {'Type':<12} {'Qty':<5} {'Ref':<10}"
+SEARCH_HEADER = f"{'ID':<5} {'SKU':<10} {'Name':<30} {'Category':<15} {'Price':<10}"
+
+
+def format_rows(fmt: str, rows: List[Dict[str, Any]], defaults: Dict[str, Any]) -> str:
+    """Render rows with a precompiled template, substituting defaults for None"""
+    format_row = fmt.format_map
+    lines = []
+    for row in rows:
+        r = dict(row)
+        for key, default in defaults.items():
+            if r[key] is None:
+                r[key] = default
+        lines.append(format_row(r))
+    return "\n".join(lines)
+
+
+# Static transaction-type reference, mirroring the rows seeded into the
+# transaction_types table by the schema. Keeping it in-process avoids a
+# round-trip and per-call menu formatting when recording transactions.
+TRANSACTION_TYPES = {
+    1: ("Purchase", "Increase"),
+    2: ("Sale", "Decrease"),
+    3: ("Adjustment", None),
+    4: ("Transfer In", "Increase"),
+    5: ("Transfer Out", "Decrease"),
+    6: ("Return In", "Increase"),
+    7: ("Return Out", "Decrease"),
+    8: ("Write Off", "Decrease"),
+}
+
+# Menu rendered once at import time
+TX_TYPE_MENU = "\nTransaction Types:\n" + "\n".join(
+    f"{type_id}: {name} ({effect})" if effect else f"{type_id}: {name}"
+    for type_id, (name, effect) in TRANSACTION_TYPES.items()
+) + "\n"
+
+
+# Numeric validation without the exception machinery: raising and catching
+# ValueError per invalid (or merely empty) field is costly in scripted runs,
+# so validate with a compiled regex and return a default instead.
+_INT_RE = re.compile(r"\A-?\d+\Z")
+_FLOAT_RE = re.compile(r"\A-?(?:\d+\.?\d*|\.\d+)\Z")
+
+
+def parse_int(s: str, default: Optional[int] = None) -> Optional[int]:
+    """Parse an integer, returning default instead of raising on bad input"""
+    s = s.strip()
+    return int(s) if _INT_RE.match(s) else default
+
+
+def parse_float(s: str, default: Optional[float] = None) -> Optional[float]:
+    """Parse a float, returning default instead of raising on bad input"""
+    s = s.strip()
+    return float(s) if _FLOAT_RE.match(s) else default
+
+
+def parse_key_values(arg: str) -> Dict[str, str]:
+    """Parse a 'key=value key2=value2 ...' argument string into a dict.
+
+    Values may be quoted (shlex rules), e.g. name=\"Laptop Computer\".
+    Raises ValueError for tokens that are not key=value pairs.
+    """
+    pairs = {}
+    for token in shlex.split(arg):
+        if "=" not in token:
+            raise ValueError(f"Expected key=value, got: {token}")
+        key, value = token.split("=", 1)
+        pairs[key] = value
+    return pairs
+
+
+def write_table(title: str, sep: str, header: str, body: str) -> None:
+    """Write a complete table (title, header, separators, rows) in one call.
+
+    Batching the output into a single sys.stdout.write avoids a lock
+    acquisition and flush per row, which dominates on large listings.
+    Callers pass one of the precomputed SEP_* constants as sep.
+    """
+    sys.stdout.write(f"\n{title}:\n{sep}\n{header}\n{sep}\n{body}\n")
+
+
+def write_table_stream(title: str, sep: str, header: str, lines,
+                       batch_size: int = 256) -> bool:
+    """Stream table rows to stdout in batches of batch_size lines.
+
+    Works with a row generator so arbitrarily long listings keep memory
+    flat and the first rows appear before the query has fully drained.
+    Returns True if any rows were written.
+    """
+    buf = []
+    wrote_any = False
+    for line in lines:
+        if not wrote_any:
+            sys.stdout.write(f"\n{title}:\n{sep}\n{header}\n{sep}\n")
+            wrote_any = True
+        buf.append(line)
+        if len(buf) >= batch_size:
+            sys.stdout.write("\n".join(buf) + "\n")
+            buf = []
+    if buf:
+        sys.stdout.write("\n".join(buf) + "\n")
+    return wrote_any
 
 class InventoryCLI(cmd.Cmd):
     """Command-line interface for the Inventory Management System"""
     
-    intro = textwrap.dedent("""
-    =====================================
-    Inventory Management System
-    =====================================
-    Type 'help' or '?' to list commands.
-    Type 'exit' or 'quit' to exit.
-    """)
+    intro = """
+=====================================
+Inventory Management System
+=====================================
+Type 'help' or '?' to list commands.
+Type 'exit' or 'quit' to exit.
+"""
     
     prompt = "inventory> "
     
     def __init__(self):
         super().__init__()
-        self.inventory_system = InventorySystem()
+        self._inventory_system = None
         self.current_product_id = None
         self.current_location_id = None
+        # Cached copies of the small reference tables so repeated listings
+        # don't hit the database on every command; invalidated on writes
+        self._cat_cache = None
+        self._sup_cache = None
+        self._loc_cache = None
+        # Last fetched product, as (product_id, row); avoids re-fetching the
+        # current product on every repeat transaction command
+        self._current_product_cache = None
+        # Small worker pool for firing independent DB queries concurrently
+        self._pool = ThreadPoolExecutor(max_workers=4)
+        # When driven by a piped script, pre-read the whole script once and
+        # let cmd.Cmd drain cmdqueue instead of issuing a read per line
+        if not sys.stdin.isatty():
+            self.use_rawinput = False
+            self.cmdqueue = sys.stdin.read().splitlines()
+
+    @property
+    def inventory_system(self):
+        """The inventory system, constructed on first use.
+
+        Deferring the import and the database connection means commands
+        that never touch the database don't pay for either.
+        """
+        if self._inventory_system is None:
+            from inventory_system import InventorySystem
+            self._inventory_system = InventorySystem()
+        return self._inventory_system
+
+    def _get_product_cached(self, product_id):
+        """Get a product, reusing the last fetched row when the ID matches"""
+        if self._current_product_cache and self._current_product_cache[0] == product_id:
+            return self._current_product_cache[1]
+        product = self.inventory_system.product_manager.get_product(product_id)
+        if product:
+            self._current_product_cache = (product_id, product)
+        return product
+
+    def _input(self, prompt):
+        """Read a line of interactive input.
+
+        In scripted mode the answers to prompts live in the preloaded
+        cmdqueue, so drain that before falling back to input().
+        """
+        if self.cmdqueue:
+            sys.stdout.write(prompt)
+            return self.cmdqueue.pop(0)
+        return input(prompt)
+
+    def _get_categories(self):
+        """Get all categories, using the cached copy when available"""
+        if self._cat_cache is None:
+            self._cat_cache = self.inventory_system.category_manager.get_all_categories()
+        return self._cat_cache
+
+    def _get_suppliers(self):
+        """Get all suppliers, using the cached copy when available"""
+        if self._sup_cache is None:
+            self._sup_cache = self.inventory_system.supplier_manager.get_all_suppliers()
+        return self._sup_cache
+
+    def _get_locations(self):
+        """Get all locations, using the cached copy when available"""
+        if self._loc_cache is None:
+            self._loc_cache = self.inventory_system.location_manager.get_all_locations()
+        return self._loc_cache
     
     def do_exit(self, arg):
         """Exit the program"""
-        self.inventory_system.close()
+        self._pool.shutdown(wait=False)
+        if self._inventory_system is not None:
+            self._inventory_system.close()
         print("Goodbye!")
         return True
     
@@ -48,107 +246,137 @@ class InventoryCLI(cmd.Cmd):
     
     def do_categories(self, arg):
         """List all categories"""
-        categories = self.inventory_system.category_manager.get_all_categories()
+        categories = self._get_categories()
         if not categories:
             print("No categories found.")
             return
         
-        print("\nCategories:")
-        print("-" * 50)
-        print(f"{'ID':<5} {'Name':<30} {'Description':<40}")
-        print("-" * 50)
-        for category in categories:
-            print(f"{category['category_id']:<5} {category['name']:<30} {category['description'] or '':<40}")
+        write_table(
+            "Categories", SEP_50,
+            CATEGORY_HEADER,
+            format_rows(CATEGORY_ROW_FMT, categories, {"description": ""})
+        )
     
     def do_add_category(self, arg):
         """Add a new category"""
-        name = input("Category name: ")
-        description = input("Description (optional): ")
+        name = self._input("Category name: ")
+        description = self._input("Description (optional): ")
         
         try:
             category_id = self.inventory_system.category_manager.add_category(name, description)
+            self._cat_cache = None
             print(f"Category added with ID: {category_id}")
         except Exception as e:
             print(f"Error adding category: {str(e)}")
     
     def do_suppliers(self, arg):
         """List all suppliers"""
-        suppliers = self.inventory_system.supplier_manager.get_all_suppliers()
+        suppliers = self._get_suppliers()
         if not suppliers:
             print("No suppliers found.")
             return
         
-        print("\nSuppliers:")
-        print("-" * 80)
-        print(f"{'ID':<5} {'Name':<30} {'Contact':<20} {'Email':<25}")
-        print("-" * 80)
-        for supplier in suppliers:
-            print(f"{supplier['supplier_id']:<5} {supplier['name']:<30} {supplier['contact_person'] or '':<20} {supplier['email'] or '':<25}")
+        write_table(
+            "Suppliers", SEP_80,
+            SUPPLIER_HEADER,
+            format_rows(SUPPLIER_ROW_FMT, suppliers, {"contact_person": "", "email": ""})
+        )
     
     def do_add_supplier(self, arg):
         """Add a new supplier"""
-        name = input("Supplier name: ")
-        contact = input("Contact person (optional): ")
-        email = input("Email (optional): ")
-        phone = input("Phone (optional): ")
-        address = input("Address (optional): ")
+        name = self._input("Supplier name: ")
+        contact = self._input("Contact person (optional): ")
+        email = self._input("Email (optional): ")
+        phone = self._input("Phone (optional): ")
+        address = self._input("Address (optional): ")
         
         try:
             supplier_id = self.inventory_system.supplier_manager.add_supplier(name, contact, email, phone, address)
+            self._sup_cache = None
             print(f"Supplier added with ID: {supplier_id}")
         except Exception as e:
             print(f"Error adding supplier: {str(e)}")
     
     def do_locations(self, arg):
         """List all locations"""
-        locations = self.inventory_system.location_manager.get_all_locations()
+        locations = self._get_locations()
         if not locations:
             print("No locations found.")
             return
         
-        print("\nLocations:")
-        print("-" * 60)
-        print(f"{'ID':<5} {'Name':<30} {'Description':<40}")
-        print("-" * 60)
-        for location in locations:
-            print(f"{location['location_id']:<5} {location['name']:<30} {location['description'] or '':<40}")
+        write_table(
+            "Locations", SEP_60,
+            LOCATION_HEADER,
+            format_rows(LOCATION_ROW_FMT, locations, {"description": ""})
+        )
     
     def do_add_location(self, arg):
         """Add a new location"""
-        name = input("Location name: ")
-        description = input("Description (optional): ")
+        name = self._input("Location name: ")
+        description = self._input("Description (optional): ")
         
         try:
             location_id = self.inventory_system.location_manager.add_location(name, description)
+            self._loc_cache = None
             print(f"Location added with ID: {location_id}")
         except Exception as e:
             print(f"Error adding location: {str(e)}")
     
+    PRODUCTS_PAGE_SIZE = 200
+
     def do_products(self, arg):
-        """List all products"""
-        products = self.inventory_system.product_manager.get_all_products()
+        """List products, one page at a time. Usage: products [--page N]"""
+        page = 1
+        tokens = arg.split()
+        if tokens:
+            page_str = tokens[1] if tokens[0] == "--page" and len(tokens) > 1 else tokens[0]
+            parsed_page = parse_int(page_str)
+            if parsed_page is None:
+                print("Invalid page number. Showing page 1.")
+            else:
+                page = max(1, parsed_page)
+
+        # Project only the rendered columns and page through the catalog
+        products = self.inventory_system.product_manager.get_all_products(
+            columns=("product_id", "sku", "name", "category_name",
+                     "unit_price", "min_stock_level"),
+            limit=self.PRODUCTS_PAGE_SIZE,
+            offset=(page - 1) * self.PRODUCTS_PAGE_SIZE
+        )
         if not products:
-            print("No products found.")
+            print("No products found." if page == 1 else f"No products on page {page}.")
             return
-        
-        print("\nProducts:")
-        print("-" * 100)
-        print(f"{'ID':<5} {'SKU':<10} {'Name':<30} {'Category':<15} {'Price':<10} {'Min Stock':<10}")
-        print("-" * 100)
-        for product in products:
-            print(f"{product['product_id']:<5} {product['sku']:<10} {product['name']:<30} {product['category_name'] or 'N/A':<15} ${product['unit_price']:<9.2f} {product['min_stock_level']:<10}")
+
+        write_table(
+            "Products", SEP_100,
+            PRODUCT_HEADER,
+            format_rows(PRODUCT_ROW_FMT, products, {"category_name": "N/A"})
+        )
     
     def do_product(self, arg):
         """Show details for a specific product. Usage: product <id>"""
+        product_id = parse_int(arg)
+        if product_id is None:
+            print("Please provide a valid product ID.")
+            return
         try:
-            product_id = int(arg.strip())
-            product = self.inventory_system.product_manager.get_product(product_id)
+            # The product details and its inventory levels are independent
+            # queries, so fetch them concurrently instead of back-to-back
+            product_future = self._pool.submit(
+                self.inventory_system.product_manager.get_product, product_id
+            )
+            inventory_future = self._pool.submit(
+                self.inventory_system.inventory_manager.get_inventory_levels,
+                product_id=product_id
+            )
+            product = product_future.result()
+            inventory = inventory_future.result()
             if not product:
                 print(f"Product with ID {product_id} not found.")
                 return
-            
+
             print("\nProduct Details:")
-            print("-" * 60)
+            print(SEP_60)
             print(f"ID:          {product['product_id']}")
             print(f"SKU:         {product['sku']}")
             print(f"Name:        {product['name']}")
@@ -158,46 +386,51 @@ class InventoryCLI(cmd.Cmd):
             print(f"Price:       ${product['unit_price']:.2f}")
             print(f"Min Stock:   {product['min_stock_level']}")
             print(f"Max Stock:   {product['max_stock_level'] or 'N/A'}")
-            print("-" * 60)
+            print(SEP_60)
             
             # Also show inventory levels for this product
-            self.do_inventory(str(product_id))
-            
+            self._print_inventory(inventory)
+
             # Set as current product for easier transactions
             self.current_product_id = product_id
+            self._current_product_cache = (product_id, product)
             print(f"Set {product['name']} as the current product.")
-        except ValueError:
-            print("Please provide a valid product ID.")
         except Exception as e:
             print(f"Error: {str(e)}")
     
     def do_add_product(self, arg):
-        """Add a new product"""
+        """Add a new product.
+
+        Usage: add_product [sku=... name=... price=... category=...
+                            supplier=... min=... max=... description=...]
+        With key=value arguments the product is added in one shot with no
+        prompts or reference listings; with no arguments the interactive
+        flow below runs.
+        """
+        if arg.strip():
+            self._add_product_oneshot(arg)
+            return
+
+        from inventory_system import Product
+
         print("\nAdding a new product:")
-        print("-" * 30)
+        print(SEP_30)
         
         # Show categories for reference
         self.do_categories('')
-        category_id = input("\nCategory ID (optional): ")
-        category_id = int(category_id) if category_id.strip() else None
-        
+        category_id = parse_int(self._input("\nCategory ID (optional): "))
+
         # Show suppliers for reference
         self.do_suppliers('')
-        supplier_id = input("\nSupplier ID (optional): ")
-        supplier_id = int(supplier_id) if supplier_id.strip() else None
-        
-        sku = input("SKU: ")
-        name = input("Name: ")
-        description = input("Description (optional): ")
-        
-        unit_price = input("Unit price: ")
-        unit_price = float(unit_price) if unit_price.strip() else 0.0
-        
-        min_stock = input("Minimum stock level: ")
-        min_stock = int(min_stock) if min_stock.strip() else 0
-        
-        max_stock = input("Maximum stock level (optional): ")
-        max_stock = int(max_stock) if max_stock.strip() else None
+        supplier_id = parse_int(self._input("\nSupplier ID (optional): "))
+
+        sku = self._input("SKU: ")
+        name = self._input("Name: ")
+        description = self._input("Description (optional): ")
+
+        unit_price = parse_float(self._input("Unit price: "), 0.0)
+        min_stock = parse_int(self._input("Minimum stock level: "), 0)
+        max_stock = parse_int(self._input("Maximum stock level (optional): "))
         
         product = Product(
             sku=sku,
@@ -211,59 +444,111 @@ class InventoryCLI(cmd.Cmd):
         )
         
         try:
-            product_id = self.inventory_system.product_manager.add_product(product)
-            print(f"Product added with ID: {product_id}")
-            
-            # Ask if they want to add initial inventory
-            add_inventory = input("Add initial inventory? (y/n): ").lower().strip()
+            # Ask about initial inventory up front so the product and its
+            # stock can be committed together in one transaction
+            add_inventory = self._input("Add initial inventory? (y/n): ").lower().strip()
             if add_inventory == 'y':
                 self.do_locations('')
-                location_id = input("\nLocation ID: ")
-                try:
-                    location_id = int(location_id)
-                    quantity = int(input("Quantity: "))
-                    ref_number = input("Reference number (optional): ")
-                    notes = input("Notes (optional): ")
-                    
-                    transaction = InventoryTransaction(
-                        product_id=product_id,
-                        location_id=location_id,
-                        transaction_type_id=1,  # Purchase
-                        quantity=quantity,
-                        reference_number=ref_number,
-                        notes=notes,
-                        created_by="CLI User"
+                location_id = parse_int(self._input("\nLocation ID: "))
+                quantity = parse_int(self._input("Quantity: "))
+                if location_id is not None and quantity is not None:
+                    ref_number = self._input("Reference number (optional): ")
+                    notes = self._input("Notes (optional): ")
+
+                    product_id, _ = self.inventory_system.add_product_with_initial_stock(
+                        product, location_id, quantity, ref_number, notes, "CLI User"
                     )
-                    
-                    self.inventory_system.inventory_manager.record_transaction(transaction)
+                    self._current_product_cache = None
+                    print(f"Product added with ID: {product_id}")
                     print(f"Added initial inventory of {quantity} units.")
-                except ValueError:
-                    print("Invalid input. Initial inventory not added.")
+                    return
+                print("Invalid input. Adding product without initial inventory.")
+
+            product_id = self.inventory_system.product_manager.add_product(product)
+            self._current_product_cache = None
+            print(f"Product added with ID: {product_id}")
         except Exception as e:
             print(f"Error adding product: {str(e)}")
-    
+
+    def _add_product_oneshot(self, arg):
+        """Add a product from a single key=value argument string"""
+        from inventory_system import Product
+
+        try:
+            pairs = parse_key_values(arg)
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            return
+
+        allowed = {"sku", "name", "description", "category", "supplier",
+                   "price", "min", "max"}
+        unknown = set(pairs) - allowed
+        if unknown:
+            print(f"Unknown argument(s): {', '.join(sorted(unknown))}")
+            return
+        if "sku" not in pairs or "name" not in pairs:
+            print("Both sku= and name= are required.")
+            return
+
+        category_id = parse_int(pairs["category"]) if "category" in pairs else None
+        supplier_id = parse_int(pairs["supplier"]) if "supplier" in pairs else None
+        unit_price = parse_float(pairs.get("price", "0"))
+        min_stock = parse_int(pairs.get("min", "0"))
+        max_stock = parse_int(pairs["max"]) if "max" in pairs else None
+        if (("category" in pairs and category_id is None)
+                or ("supplier" in pairs and supplier_id is None)
+                or unit_price is None or min_stock is None
+                or ("max" in pairs and max_stock is None)):
+            print("Invalid numeric value in arguments.")
+            return
+
+        product = Product(
+            sku=pairs["sku"],
+            name=pairs["name"],
+            description=pairs.get("description"),
+            category_id=category_id,
+            supplier_id=supplier_id,
+            unit_price=unit_price,
+            min_stock_level=min_stock,
+            max_stock_level=max_stock
+        )
+
+        try:
+            product_id = self.inventory_system.product_manager.add_product(product)
+            self._current_product_cache = None
+            print(f"Product added with ID: {product_id}")
+        except Exception as e:
+            print(f"Error adding product: {str(e)}")
+
     def do_inventory(self, arg):
         """Show inventory levels, optionally filtered by product ID"""
         product_id = None
         
         if arg.strip():
-            try:
-                product_id = int(arg.strip())
-            except ValueError:
+            product_id = parse_int(arg)
+            if product_id is None:
                 print("Invalid product ID. Showing all inventory.")
         
-        inventory = self.inventory_system.inventory_manager.get_inventory_levels(product_id=product_id)
-        
+        rows = self.inventory_system.inventory_manager.iter_inventory_levels(product_id=product_id)
+        lines = (INVENTORY_ROW_FMT.format_map(row) for row in rows)
+        if not write_table_stream(
+            "Current Inventory Levels", SEP_80,
+            INVENTORY_HEADER,
+            lines
+        ):
+            print("No inventory records found.")
+
+    def _print_inventory(self, inventory):
+        """Print a list of inventory level records"""
         if not inventory:
             print("No inventory records found.")
             return
-        
-        print("\nCurrent Inventory Levels:")
-        print("-" * 80)
-        print(f"{'Product':<30} {'SKU':<10} {'Location':<20} {'Quantity':<10}")
-        print("-" * 80)
-        for item in inventory:
-            print(f"{item['product_name']:<30} {item['sku']:<10} {item['location_name']:<20} {item['quantity']:<10}")
+
+        write_table(
+            "Current Inventory Levels", SEP_80,
+            INVENTORY_HEADER,
+            format_rows(INVENTORY_ROW_FMT, inventory, {})
+        )
     
     def do_low_stock(self, arg):
         """Show products with low stock levels"""
@@ -273,98 +558,88 @@ class InventoryCLI(cmd.Cmd):
             print("No low stock items found.")
             return
         
-        print("\nLow Stock Items:")
-        print("-" * 90)
-        print(f"{'Product':<30} {'SKU':<10} {'Category':<15} {'Current':<10} {'Min':<10} {'To Order':<10}")
-        print("-" * 90)
-        for item in low_stock:
-            print(f"{item['name']:<30} {item['sku']:<10} {item['category']:<15} {item['total_quantity']:<10} {item['min_stock_level']:<10} {item['quantity_to_order']:<10}")
+        write_table(
+            "Low Stock Items", SEP_90,
+            LOW_STOCK_HEADER,
+            format_rows(LOW_STOCK_ROW_FMT, low_stock, {})
+        )
     
     def do_transaction(self, arg):
-        """Record a new inventory transaction"""
+        """Record a new inventory transaction.
+
+        Usage: transaction [product=... loc=... type=... qty=...
+                            ref=... notes=...]
+        With key=value arguments the transaction is recorded in one shot
+        with no prompts; with no arguments the interactive flow below runs.
+        """
+        if arg.strip():
+            self._transaction_oneshot(arg)
+            return
+
+        from inventory_system import InventoryTransaction
+
         print("\nRecording a new inventory transaction:")
-        print("-" * 40)
+        print(SEP_40)
         
         # If no current product, ask for one
         if self.current_product_id is None:
             self.do_products('')
-            product_id = input("\nProduct ID: ")
-            try:
-                product_id = int(product_id)
-                product = self.inventory_system.product_manager.get_product(product_id)
-                if not product:
-                    print(f"Product with ID {product_id} not found.")
-                    return
-                self.current_product_id = product_id
-            except ValueError:
+            product_id = parse_int(self._input("\nProduct ID: "))
+            if product_id is None:
                 print("Invalid product ID.")
                 return
+            product = self._get_product_cached(product_id)
+            if not product:
+                print(f"Product with ID {product_id} not found.")
+                return
+            self.current_product_id = product_id
         else:
-            product = self.inventory_system.product_manager.get_product(self.current_product_id)
+            product = self._get_product_cached(self.current_product_id)
             print(f"Using current product: {product['name']} (ID: {self.current_product_id})")
-            change_product = input("Change product? (y/n): ").lower().strip()
+            change_product = self._input("Change product? (y/n): ").lower().strip()
             if change_product == 'y':
                 self.do_products('')
-                product_id = input("\nProduct ID: ")
-                try:
-                    product_id = int(product_id)
-                    product = self.inventory_system.product_manager.get_product(product_id)
-                    if not product:
-                        print(f"Product with ID {product_id} not found.")
-                        return
-                    self.current_product_id = product_id
-                except ValueError:
+                product_id = parse_int(self._input("\nProduct ID: "))
+                if product_id is None:
                     print("Invalid product ID.")
                     return
-        
+                product = self._get_product_cached(product_id)
+                if not product:
+                    print(f"Product with ID {product_id} not found.")
+                    return
+                self.current_product_id = product_id
+
         # Get location
         self.do_locations('')
-        location_id = input("\nLocation ID: ")
-        try:
-            location_id = int(location_id)
-            location = self.inventory_system.location_manager.get_location(location_id)
-            if not location:
-                print(f"Location with ID {location_id} not found.")
-                return
-        except ValueError:
+        location_id = parse_int(self._input("\nLocation ID: "))
+        if location_id is None:
             print("Invalid location ID.")
             return
-        
+        location = self.inventory_system.location_manager.get_location(location_id)
+        if not location:
+            print(f"Location with ID {location_id} not found.")
+            return
+
         # Get transaction type
-        print("\nTransaction Types:")
-        print("1: Purchase (Increase)")
-        print("2: Sale (Decrease)")
-        print("3: Adjustment")
-        print("4: Transfer In (Increase)")
-        print("5: Transfer Out (Decrease)")
-        print("6: Return In (Increase)")
-        print("7: Return Out (Decrease)")
-        print("8: Write Off (Decrease)")
-        
-        transaction_type_id = input("\nTransaction Type ID: ")
-        try:
-            transaction_type_id = int(transaction_type_id)
-            if transaction_type_id < 1 or transaction_type_id > 8:
-                print("Invalid transaction type ID.")
-                return
-        except ValueError:
+        sys.stdout.write(TX_TYPE_MENU)
+
+        transaction_type_id = parse_int(self._input("\nTransaction Type ID: "))
+        if transaction_type_id is None or transaction_type_id not in TRANSACTION_TYPES:
             print("Invalid transaction type ID.")
             return
-        
+
         # Get quantity
-        quantity = input("Quantity: ")
-        try:
-            quantity = int(quantity)
-            if quantity <= 0:
-                print("Quantity must be positive.")
-                return
-        except ValueError:
+        quantity = parse_int(self._input("Quantity: "))
+        if quantity is None:
             print("Invalid quantity.")
             return
+        if quantity <= 0:
+            print("Quantity must be positive.")
+            return
         
         # Get additional details
-        reference_number = input("Reference Number (optional): ")
-        notes = input("Notes (optional): ")
+        reference_number = self._input("Reference Number (optional): ")
+        notes = self._input("Notes (optional): ")
         
         # Create and record the transaction
         transaction = InventoryTransaction(
@@ -378,14 +653,122 @@ class InventoryCLI(cmd.Cmd):
         )
         
         try:
-            transaction_id = self.inventory_system.inventory_manager.record_transaction(transaction)
+            transaction_id, new_quantity = self.inventory_system.inventory_manager.record_transaction(transaction)
             print(f"Transaction recorded with ID: {transaction_id}")
-            
-            # Show updated inventory
-            self.do_inventory(str(self.current_product_id))
+            print(f"New quantity of {product['name']} at {location['name']}: {new_quantity}")
+        except Exception as e:
+            print(f"Error recording transaction: {str(e)}")
+
+    def _transaction_oneshot(self, arg):
+        """Record a transaction from a single key=value argument string"""
+        from inventory_system import InventoryTransaction
+
+        try:
+            pairs = parse_key_values(arg)
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            return
+
+        allowed = {"product", "loc", "type", "qty", "ref", "notes"}
+        unknown = set(pairs) - allowed
+        if unknown:
+            print(f"Unknown argument(s): {', '.join(sorted(unknown))}")
+            return
+        missing = {"product", "loc", "type", "qty"} - set(pairs)
+        if missing:
+            print(f"Missing required argument(s): {', '.join(sorted(missing))}")
+            return
+
+        product_id = parse_int(pairs["product"])
+        location_id = parse_int(pairs["loc"])
+        transaction_type_id = parse_int(pairs["type"])
+        quantity = parse_int(pairs["qty"])
+        if None in (product_id, location_id, transaction_type_id, quantity):
+            print("Invalid numeric value in arguments.")
+            return
+        if transaction_type_id not in TRANSACTION_TYPES:
+            print("Invalid transaction type ID.")
+            return
+        if quantity <= 0:
+            print("Quantity must be positive.")
+            return
+
+        # Validate both IDs with a single round-trip before inserting
+        check = self.inventory_system.inventory_manager.validate_product_location(
+            product_id, location_id
+        )
+        if check["product_name"] is None:
+            print(f"Product with ID {product_id} not found.")
+            return
+        if check["location_name"] is None:
+            print(f"Location with ID {location_id} not found.")
+            return
+
+        transaction = InventoryTransaction(
+            product_id=product_id,
+            location_id=location_id,
+            transaction_type_id=transaction_type_id,
+            quantity=quantity,
+            reference_number=pairs.get("ref"),
+            notes=pairs.get("notes"),
+            created_by="CLI User"
+        )
+
+        try:
+            transaction_id, new_quantity = self.inventory_system.inventory_manager.record_transaction(transaction)
+            print(f"Transaction recorded with ID: {transaction_id}")
+            print(f"New quantity of {check['product_name']} at {check['location_name']}: {new_quantity}")
         except Exception as e:
             print(f"Error recording transaction: {str(e)}")
     
+    BULK_BATCH_SIZE = 500
+
+    def do_bulk_transaction(self, arg):
+        """Record transactions in bulk from a CSV file. Usage: bulk_transaction <csvfile>
+
+        Expected columns: product_id, location_id, transaction_type_id,
+        quantity; optional: reference_number, notes, created_by.
+        """
+        path = arg.strip()
+        if not path:
+            print("Please provide a CSV file path.")
+            return
+
+        from inventory_system import InventoryTransaction
+
+        total = 0
+        batch = []
+        try:
+            with open(path, newline="") as f:
+                for line_num, row in enumerate(csv.DictReader(f), start=2):
+                    try:
+                        transaction = InventoryTransaction(
+                            product_id=int(row["product_id"]),
+                            location_id=int(row["location_id"]),
+                            transaction_type_id=int(row["transaction_type_id"]),
+                            quantity=int(row["quantity"]),
+                            reference_number=row.get("reference_number") or None,
+                            notes=row.get("notes") or None,
+                            created_by=row.get("created_by") or "CLI User"
+                        )
+                    except (KeyError, TypeError, ValueError):
+                        print(f"Invalid row on line {line_num}; nothing recorded from this batch.")
+                        return
+                    batch.append(transaction)
+                    if len(batch) >= self.BULK_BATCH_SIZE:
+                        total += self.inventory_system.inventory_manager.record_transactions(batch)
+                        batch = []
+                if batch:
+                    total += self.inventory_system.inventory_manager.record_transactions(batch)
+        except FileNotFoundError:
+            print(f"File not found: {path}")
+            return
+        except Exception as e:
+            print(f"Error recording bulk transactions: {str(e)}")
+            return
+
+        print(f"Recorded {total} transactions from {path}.")
+
     def do_history(self, arg):
         """Show transaction history. Usage: history [product_id] [limit]"""
         args = arg.strip().split()
@@ -393,31 +776,40 @@ class InventoryCLI(cmd.Cmd):
         limit = 10
         
         if len(args) >= 1:
-            try:
-                product_id = int(args[0])
-            except ValueError:
+            product_id = parse_int(args[0])
+            if product_id is None:
                 print("Invalid product ID. Showing all transactions.")
-        
+
         if len(args) >= 2:
-            try:
-                limit = int(args[1])
-            except ValueError:
+            parsed_limit = parse_int(args[1])
+            if parsed_limit is None:
                 print("Invalid limit. Using default limit of 10.")
+            else:
+                limit = parsed_limit
         
-        transactions = self.inventory_system.inventory_manager.get_transaction_history(
+        transactions = self.inventory_system.inventory_manager.iter_transaction_history(
             product_id=product_id, limit=limit
         )
-        
-        if not transactions:
+
+        format_row = HISTORY_ROW_FMT.format_map
+
+        def history_lines():
+            for row in transactions:
+                # sqlite3.Row is immutable, so copy before truncating the
+                # display fields
+                tx = dict(row)
+                tx["product_name"] = tx["product_name"][:25]
+                tx["location_name"] = tx["location_name"][:15]
+                if tx["reference_number"] is None:
+                    tx["reference_number"] = ""
+                yield format_row(tx)
+
+        if not write_table_stream(
+            "Transaction History", SEP_100,
+            HISTORY_HEADER,
+            history_lines()
+        ):
             print("No transactions found.")
-            return
-        
-        print("\nTransaction History:")
-        print("-" * 100)
-        print(f"{'ID':<5} {'Date':<20} {'Product':<25} {'Location':<15} {'Type':<12} {'Qty':<5} {'Ref':<10}")
-        print("-" * 100)
-        for tx in transactions:
-            print(f"{tx['transaction_id']:<5} {tx['transaction_date']:<20} {tx['product_name'][:25]:<25} {tx['location_name'][:15]:<15} {tx['transaction_type']:<12} {tx['quantity']:<5} {tx['reference_number'] or '':<10}")
     
     def do_search(self, arg):
         """Search for products. Usage: search <term>"""
@@ -432,17 +824,11 @@ class InventoryCLI(cmd.Cmd):
             print(f"No products found matching '{search_term}'.")
             return
         
-        print(f"\nSearch results for '{search_term}':")
-        print("-" * 80)
-        print(f"{'ID':<5} {'SKU':<10} {'Name':<30} {'Category':<15} {'Price':<10}")
-        print("-" * 80)
-        for product in results:
-            print(f"{product['product_id']:<5} {product['sku']:<10} {product['name']:<30} {product['category_name'] or 'N/A':<15} ${product['unit_price']:<9.2f}")
+        write_table(
+            f"Search results for '{search_term}'", SEP_80,
+            SEARCH_HEADER,
+            format_rows(SEARCH_ROW_FMT, results, {"category_name": "N/A"})
+        )
     
-    def do_help(self, arg):
-        """List available commands with brief descriptions"""
-        cmd.Cmd.do_help(self, arg)
-
-
 if __name__ == "__main__":
     InventoryCLI().cmdloop()
\ No newline at end of file
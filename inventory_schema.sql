@@ -4,7 +4,7 @@
 PRAGMA foreign_keys = ON;
 
 -- Categories table - for grouping products
-CREATE TABLE categories (
+CREATE TABLE IF NOT EXISTS categories (
     category_id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL UNIQUE,
     description TEXT,
@@ -13,7 +13,7 @@ CREATE TABLE categories (
 );
 
 -- Suppliers table - sources of products
-CREATE TABLE suppliers (
+CREATE TABLE IF NOT EXISTS suppliers (
     supplier_id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL,
     contact_person TEXT,
@@ -26,7 +26,7 @@ CREATE TABLE suppliers (
 );
 
 -- Locations table - where items are stored
-CREATE TABLE locations (
+CREATE TABLE IF NOT EXISTS locations (
     location_id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL UNIQUE,
     description TEXT,
@@ -36,7 +36,7 @@ CREATE TABLE locations (
 );
 
 -- Products table - core inventory items
-CREATE TABLE products (
+CREATE TABLE IF NOT EXISTS products (
     product_id INTEGER PRIMARY KEY AUTOINCREMENT,
     sku TEXT NOT NULL UNIQUE,
     name TEXT NOT NULL,
@@ -54,7 +54,7 @@ CREATE TABLE products (
 );
 
 -- Inventory table - current stock levels by location
-CREATE TABLE inventory (
+CREATE TABLE IF NOT EXISTS inventory (
     inventory_id INTEGER PRIMARY KEY AUTOINCREMENT,
     product_id INTEGER NOT NULL,
     location_id INTEGER NOT NULL,
@@ -68,7 +68,7 @@ CREATE TABLE inventory (
 );
 
 -- Transaction types table - for categorizing inventory movements
-CREATE TABLE transaction_types (
+CREATE TABLE IF NOT EXISTS transaction_types (
     transaction_type_id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL UNIQUE,
     affects_inventory INTEGER NOT NULL, -- 1 for increase, -1 for decrease, 0 for no effect
@@ -77,7 +77,7 @@ CREATE TABLE transaction_types (
 );
 
 -- Inventory transactions table - record of all inventory movements
-CREATE TABLE inventory_transactions (
+CREATE TABLE IF NOT EXISTS inventory_transactions (
     transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
     product_id INTEGER NOT NULL,
     location_id INTEGER NOT NULL,
@@ -94,7 +94,7 @@ CREATE TABLE inventory_transactions (
 );
 
 -- Purchase orders table - for incoming inventory
-CREATE TABLE purchase_orders (
+CREATE TABLE IF NOT EXISTS purchase_orders (
     po_id INTEGER PRIMARY KEY AUTOINCREMENT,
     supplier_id INTEGER NOT NULL,
     order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -109,7 +109,7 @@ CREATE TABLE purchase_orders (
 );
 
 -- Purchase order items - details of items in purchase orders
-CREATE TABLE purchase_order_items (
+CREATE TABLE IF NOT EXISTS purchase_order_items (
     po_item_id INTEGER PRIMARY KEY AUTOINCREMENT,
     po_id INTEGER NOT NULL,
     product_id INTEGER NOT NULL,
@@ -124,7 +124,7 @@ CREATE TABLE purchase_order_items (
 );
 
 -- Insert default transaction types
-INSERT INTO transaction_types (name, affects_inventory, description) VALUES
+INSERT OR IGNORE INTO transaction_types (name, affects_inventory, description) VALUES
 ('Purchase', 1, 'Inventory received from supplier'),
 ('Sale', -1, 'Inventory sold to customer'),
 ('Adjustment', 0, 'Manual inventory adjustment'),
@@ -135,20 +135,26 @@ INSERT INTO transaction_types (name, affects_inventory, description) VALUES
 ('Write Off', -1, 'Inventory written off (damaged, lost, expired)');
 
 -- Create indexes for performance
-CREATE INDEX idx_products_category ON products(category_id);
-CREATE INDEX idx_products_supplier ON products(supplier_id);
-CREATE INDEX idx_inventory_product ON inventory(product_id);
-CREATE INDEX idx_inventory_location ON inventory(location_id);
-CREATE INDEX idx_transactions_product ON inventory_transactions(product_id);
-CREATE INDEX idx_transactions_location ON inventory_transactions(location_id);
-CREATE INDEX idx_transactions_type ON inventory_transactions(transaction_type_id);
-CREATE INDEX idx_po_supplier ON purchase_orders(supplier_id);
-CREATE INDEX idx_po_items_po ON purchase_order_items(po_id);
-CREATE INDEX idx_po_items_product ON purchase_order_items(product_id);
+CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_id);
+CREATE INDEX IF NOT EXISTS idx_products_supplier ON products(supplier_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_product ON inventory(product_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_product_qty ON inventory(product_id, quantity);
+CREATE INDEX IF NOT EXISTS idx_inventory_location ON inventory(location_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_product ON inventory_transactions(product_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_location ON inventory_transactions(location_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_type ON inventory_transactions(transaction_type_id);
+CREATE INDEX IF NOT EXISTS idx_po_supplier ON purchase_orders(supplier_id);
+CREATE INDEX IF NOT EXISTS idx_po_items_po ON purchase_order_items(po_id);
+CREATE INDEX IF NOT EXISTS idx_po_items_product ON purchase_order_items(product_id);
+
+-- The products full-text search index lives outside this script:
+-- DatabaseManager._ensure_search_index creates it after bootstrap, so a
+-- sqlite build without FTS5 still gets a working database (search falls
+-- back to a LIKE scan).
 
 -- Create views for common queries
 -- Current inventory status
-CREATE VIEW vw_current_inventory AS
+CREATE VIEW IF NOT EXISTS vw_current_inventory AS
 SELECT 
     p.product_id,
     p.sku,
@@ -182,7 +188,7 @@ WHERE
     p.is_active = 1;
 
 -- Products that need reordering
-CREATE VIEW vw_reorder_list AS
+CREATE VIEW IF NOT EXISTS vw_reorder_list AS
 SELECT 
     p.product_id,
     p.sku,
@@ -209,7 +215,7 @@ HAVING
     SUM(i.quantity) < p.min_stock_level;
 
 -- Recent transactions
-CREATE VIEW vw_recent_transactions AS
+CREATE VIEW IF NOT EXISTS vw_recent_transactions AS
 SELECT 
     t.transaction_id,
     p.sku,
@@ -6,28 +6,73 @@ Provides core functionality for managing products, inventory, and transactions.
 """
 
 import sqlite3
-import os
-import datetime
+import atexit
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional, Tuple, Union
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from dataclasses import dataclass
 
-# Set up logging
+# Set up logging. Records are handed to an in-process queue and written
+# out by a background listener thread, so the write+flush of the file and
+# stream handlers never blocks the thread doing database work. delay=True
+# defers opening the log file until the first record.
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_targets = [
+    logging.FileHandler("inventory_system.log", delay=True),
+    logging.StreamHandler()
+]
+for _handler in _log_targets:
+    _handler.setFormatter(_log_formatter)
+_queue_handler = QueueHandler(_log_queue)
+# The queue handler must pass records through unformatted (the listener's
+# handlers format them); a bare %(message)s formatter stops basicConfig
+# from installing its default one on top
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("inventory_system.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[_queue_handler]
 )
+_log_listener = QueueListener(_log_queue, *_log_targets)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Drain pending records on shutdown
 logger = logging.getLogger("inventory_system")
 
 # Database configuration
 DB_FILE = "inventory.db"
 
-# Data classes for type safety and better code organization
-@dataclass
+# Full-text search index over products, kept in sync by triggers. Turns the
+# previous LIKE '%term%' full-table scan into an inverted-index lookup.
+FTS_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    name, sku, description,
+    content='products', content_rowid='product_id'
+);
+CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts(rowid, name, sku, description)
+    VALUES (new.product_id, new.name, new.sku, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, name, sku, description)
+    VALUES ('delete', old.product_id, old.name, old.sku, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, name, sku, description)
+    VALUES ('delete', old.product_id, old.name, old.sku, old.description);
+    INSERT INTO products_fts(rowid, name, sku, description)
+    VALUES (new.product_id, new.name, new.sku, new.description);
+END;
+"""
+
+# Data classes for type safety and better code organization.
+# slots=True drops the per-instance __dict__, which matters when the bulk
+# paths build thousands of these: smaller instances and fixed-offset
+# attribute reads instead of dict lookups.
+@dataclass(slots=True)
 class Product:
     product_id: Optional[int] = None
     sku: str = ""
@@ -40,7 +85,7 @@ class Product:
     max_stock_level: Optional[int] = None
     is_active: bool = True
 
-@dataclass
+@dataclass(slots=True)
 class InventoryTransaction:
     product_id: int
     location_id: int
@@ -52,64 +97,337 @@ class InventoryTransaction:
     transaction_id: Optional[int] = None
     transaction_date: Optional[str] = None
 
+class ConnectionPool:
+    """A small pool of read-only connections for SELECT traffic.
+
+    SQLite's page cache is per connection, so recycling warm connections
+    (LIFO: the most recently returned one is handed out next) keeps hot
+    pages cached across callers, and under WAL the pooled readers run
+    concurrently with the writer. PRAGMA query_only guarantees a
+    connection borrowed for a SELECT can't accidentally write.
+    """
+
+    def __init__(self, db_file: str, size: int = 4):
+        self.db_file = db_file
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._make_connection())
+
+    def _make_connection(self) -> sqlite3.Connection:
+        # check_same_thread=False is safe here: acquire() hands a
+        # connection to exactly one thread at a time
+        conn = sqlite3.connect(self.db_file, cached_statements=256,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in ("query_only=1",
+                       "temp_store=MEMORY",
+                       "cache_size=-65536",
+                       "mmap_size=268435456"):
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection; blocks if all are in use"""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
 class DatabaseManager:
     """Manages database connections and provides utility methods"""
-    
+
+    # Dedicated cursors kept alive per thread for statement reuse; sized to
+    # comfortably hold every distinct query the system issues
+    STMT_CACHE_SIZE = 128
+
+    # Compiled schema shared by every DatabaseManager in the process: the
+    # DDL script is parsed once into an in-memory template database, and
+    # fresh databases are cloned from it page-by-page with the backup API
+    # instead of re-running the script. Built lazily on the first fresh
+    # database, so processes that only open existing files never pay for it.
+    _schema_template: Optional[sqlite3.Connection] = None
+
     def __init__(self, db_file: str = DB_FILE):
         """Initialize the database manager"""
         self.db_file = db_file
-        self.conn = None
+        # One connection per thread: sqlite serializes access to a shared
+        # connection, so giving each worker thread its own is what lets
+        # queries fanned out to a thread pool actually run concurrently
+        self._local = threading.local()
+        # Read-only pool for SELECTs, created on first use (the schema has
+        # to exist before query_only readers make sense)
+        self._read_pool: Optional[ConnectionPool] = None
+        self.fts_enabled = False
         self.initialize_db()
-        
+
     def get_connection(self) -> sqlite3.Connection:
-        """Get a connection to the database"""
-        if self.conn is None:
-            self.conn = sqlite3.connect(self.db_file)
-            self.conn.row_factory = sqlite3.Row  # Access columns by name
-            self.conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign key constraints
-        return self.conn
-    
+        """Get the calling thread's connection to the database"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # cached_statements is sized so the whole CLI statement working
+            # set stays compiled and repeat queries skip SQL re-parsing.
+            # isolation_level=None turns off the driver's implicit BEGIN:
+            # single statements autocommit, and the multi-statement paths
+            # control their own transactions with explicit BEGIN/COMMIT.
+            conn = sqlite3.connect(self.db_file, cached_statements=256,
+                                   isolation_level=None)
+            conn.row_factory = sqlite3.Row  # Access columns by name
+            # WAL avoids the rollback journal's double-write and lets
+            # readers proceed alongside a writer; synchronous=NORMAL halves
+            # the fsyncs per commit (still durable across app crashes).
+            # The rest keep temp structures and hot pages in memory.
+            for pragma in ("journal_mode=WAL",
+                           "synchronous=NORMAL",
+                           "temp_store=MEMORY",
+                           "cache_size=-65536",
+                           "mmap_size=268435456",
+                           "foreign_keys=ON"):
+                conn.execute(f"PRAGMA {pragma}")
+            self._local.conn = conn
+        return conn
+
+    def _cached_cursor(self, query: str) -> sqlite3.Cursor:
+        """Return a reusable cursor dedicated to this SQL text.
+
+        sqlite3 keeps the most recently executed statement compiled on each
+        cursor, so giving every distinct query its own long-lived cursor
+        lets repeat executions skip the SQL parse/plan step entirely.
+        The cache is per thread (cursors belong to the thread's connection)
+        and evicts least-recently-used entries beyond STMT_CACHE_SIZE.
+
+        Only the recurring query/insert/update paths belong here. One-shot
+        statements -- DDL in initialize_db, the FTS setup scripts, PRAGMAs
+        -- go through conn.execute/executescript instead, so their
+        compiled form is dropped immediately rather than pinning a slot
+        in this cache (the same cached-vs-single-use statement split
+        sqlite's own SQLITE_PREPARE_PERSISTENT flag draws, which the
+        Python driver does not expose).
+        """
+        cache = getattr(self._local, "stmt_cache", None)
+        if cache is None:
+            cache = self._local.stmt_cache = OrderedDict()
+        cursor = cache.get(query)
+        if cursor is None:
+            cursor = self.get_connection().cursor()
+            cache[query] = cursor
+            if len(cache) > self.STMT_CACHE_SIZE:
+                _, evicted = cache.popitem(last=False)
+                evicted.close()
+        else:
+            cache.move_to_end(query)
+        return cursor
+
+    @property
+    def read_pool(self) -> ConnectionPool:
+        """The read-only connection pool, created on first use"""
+        if self._read_pool is None:
+            self._read_pool = ConnectionPool(self.db_file)
+        return self._read_pool
+
     def close_connection(self) -> None:
-        """Close the database connection"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Close the calling thread's database connection and the read pool"""
+        conn = getattr(self._local, "conn", None)
+        if conn:
+            self._local.stmt_cache = None  # Cursors die with the connection
+            conn.close()
+            self._local.conn = None
+        if self._read_pool is not None:
+            self._read_pool.close()
+            self._read_pool = None
     
+    @classmethod
+    def _get_schema_template(cls) -> sqlite3.Connection:
+        """The in-memory database holding the fully-applied schema.
+
+        The template carries user_version = 1 so clones come out already
+        stamped as initialized.
+        """
+        if cls._schema_template is None:
+            template = sqlite3.connect(":memory:", check_same_thread=False)
+            with open("inventory_schema.sql", "r") as f:
+                template.executescript(f.read())
+            template.execute("PRAGMA user_version = 1")
+            template.commit()
+            cls._schema_template = template
+        return cls._schema_template
+
     def initialize_db(self) -> None:
-        """Initialize the database if it doesn't exist"""
-        if not os.path.exists(self.db_file):
-            logger.info(f"Creating new database file: {self.db_file}")
-            
-            # Create a connection
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Read and execute the schema SQL file
+        """Initialize the database schema if it hasn't been applied yet.
+
+        The schema is versioned with PRAGMA user_version instead of an
+        os.path.exists check on the file: connecting creates the file
+        anyway, the pragma read is a page-one lookup rather than a stat,
+        and two processes racing to initialize both run the idempotent
+        script instead of one seeing a half-created file.
+        """
+        conn = self.get_connection()
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if user_version == 0:
+            logger.info(f"Initializing database schema in {self.db_file}")
             try:
-                with open("inventory_schema.sql", "r") as f:
-                    schema_sql = f.read()
-                    cursor.executescript(schema_sql)
-                conn.commit()
+                if conn.execute("SELECT count(*) FROM sqlite_master").fetchone()[0] == 0:
+                    # Empty database: clone the prebuilt template at the
+                    # page level, skipping the DDL parse entirely
+                    self._get_schema_template().backup(conn)
+                else:
+                    # Database created by an older, unversioned schema:
+                    # every statement in the script is idempotent, so
+                    # running it just fills in what is missing
+                    with open("inventory_schema.sql", "r") as f:
+                        conn.executescript(f.read())
+                    conn.execute("PRAGMA user_version = 1")
+                    conn.commit()
                 logger.info("Database schema created successfully")
             except Exception as e:
                 logger.error(f"Error creating database schema: {str(e)}")
                 conn.rollback()
                 raise
-            finally:
-                cursor.close()
-        else:
-            logger.info(f"Using existing database file: {self.db_file}")
-    
-    def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
-        """Execute a SELECT query and return the results as a list of dictionaries"""
+
+        self._ensure_search_index()
+
+    def _ensure_search_index(self) -> None:
+        """Create the products full-text index if it doesn't exist yet.
+
+        The DDL is idempotent, so this doubles as the migration path for
+        databases created before the index was introduced. If this sqlite
+        build lacks FTS5, search falls back to a LIKE scan.
+        """
+        conn = self.get_connection()
+        existing = self.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+        )
+        if existing:
+            self.fts_enabled = True
+            # A migrated database can carry an empty index next to rows
+            # that predate it (the table was created without a backfill);
+            # rebuild once so those products are searchable. The docsize
+            # shadow table holds one row per indexed document -- a plain
+            # scan of the FTS table itself won't do, because with external
+            # content it reads through to the products table
+            if (conn.execute("SELECT 1 FROM products_fts_docsize LIMIT 1").fetchone() is None
+                    and conn.execute("SELECT 1 FROM products LIMIT 1").fetchone() is not None):
+                conn.execute("INSERT INTO products_fts(products_fts) VALUES('rebuild')")
+                conn.commit()
+                logger.info("Rebuilt full-text search index for products")
+            return
+
+        try:
+            conn.executescript(FTS_DDL)
+            # Index any rows that predate the virtual table
+            conn.execute("INSERT INTO products_fts(products_fts) VALUES('rebuild')")
+            conn.commit()
+            self.fts_enabled = True
+            logger.info("Created full-text search index for products")
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            logger.warning(f"Full-text search unavailable, using LIKE fallback: {str(e)}")
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether the calling thread is inside a transaction() block"""
+        return getattr(self._local, "tx_depth", 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one database transaction.
+
+        Inside the block, execute_insert/execute_update skip their per-call
+        commit; everything is committed once on exit (or rolled back if the
+        block raises). Nesting is allowed — only the outermost block issues
+        BEGIN/COMMIT — so the manager methods that already run their own
+        transactions compose with a caller's larger one. BEGIN IMMEDIATE
+        takes the write lock up front rather than on the first write.
+        Yields the calling thread's connection.
+        """
         conn = self.get_connection()
-        cursor = conn.cursor()
+        depth = getattr(self._local, "tx_depth", 0)
+        if depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.tx_depth = depth + 1
+        try:
+            yield conn
+            if depth == 0:
+                conn.execute("COMMIT")
+        except Exception:
+            if depth == 0:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.tx_depth = depth
+
+    def execute_query(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Execute a SELECT query and return the results as a list of rows.
+
+        Rows are sqlite3.Row objects: indexable by column name like a dict
+        but without the per-row dict materialization the old conversion
+        paid on every SELECT.
+
+        Plain reads are served from the read-only pool, so under WAL they
+        run concurrently with a writer. Inside a transaction() block the
+        thread's writer connection is used instead, so the query sees the
+        transaction's own uncommitted rows.
+        """
+        try:
+            if self.in_transaction:
+                cursor = self._cached_cursor(query)
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            with self.read_pool.acquire() as conn:
+                return conn.execute(query, params).fetchall()
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            logger.error(f"Query: {query}")
+            logger.error(f"Params: {params}")
+            raise
+
+    def fetch_one(self, query: str, params: tuple = ()) -> Optional[sqlite3.Row]:
+        """Execute a point SELECT and return its single row, or None.
+
+        The fast path for primary-key lookups: the statement runs on the
+        calling thread's connection through the cursor cache, so repeat
+        lookups reuse the compiled statement, and a single fetchone
+        replaces the fetchall-then-index-zero of execute_query — no pool
+        round-trip, no result list.
+        """
         try:
+            cursor = self._cached_cursor(query)
             cursor.execute(query, params)
-            rows = cursor.fetchall()
-            # Convert sqlite3.Row objects to dictionaries
-            result = [dict(row) for row in rows]
-            return result
+            return cursor.fetchone()
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            logger.error(f"Query: {query}")
+            logger.error(f"Params: {params}")
+            raise
+
+    def execute_query_iter(self, query: str, params: tuple = (),
+                           batch_size: int = 256):
+        """Execute a SELECT query and yield sqlite3.Row objects one at a time.
+
+        Rows are fetched from the cursor in batches of batch_size, so peak
+        memory stays bounded regardless of the result size and the first
+        rows are available before the full result set has been read.
+        """
+        # conn.execute's transient cursor skips the explicit create/close
+        # lifecycle; it still needs closing here because the generator may
+        # outlive several fetchmany batches
+        cursor = self.get_connection().execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
         except Exception as e:
             logger.error(f"Error executing query: {str(e)}")
             logger.error(f"Query: {query}")
@@ -117,90 +435,129 @@ class DatabaseManager:
             raise
         finally:
             cursor.close()
-    
+
+    def execute_query_columnar(self, query: str,
+                               params: tuple = ()) -> Dict[str, list]:
+        """Execute a SELECT query and return columns instead of rows.
+
+        The result maps each column name to a list of its values — a
+        structure-of-arrays layout for analytical passes (totals, exports,
+        reorder math) that touch one or two columns across many rows.
+        Iterating a plain list per column avoids the per-row object and
+        per-access name lookup of row-shaped results, and the lists feed
+        directly into sum()/min()/max() or numpy.fromiter.
+        """
+        try:
+            with self.read_pool.acquire() as conn:
+                cursor = conn.execute(query, params)
+                names = [d[0] for d in cursor.description]
+                rows = cursor.fetchall()
+            # zip(*rows) transposes row tuples into per-column tuples in C
+            columns = zip(*rows) if rows else ((),) * len(names)
+            return {name: list(column) for name, column in zip(names, columns)}
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            logger.error(f"Query: {query}")
+            logger.error(f"Params: {params}")
+            raise
+
     def execute_insert(self, query: str, params: tuple = ()) -> int:
         """Execute an INSERT query and return the ID of the inserted row"""
         conn = self.get_connection()
-        cursor = conn.cursor()
+        cursor = self._cached_cursor(query)
         try:
             cursor.execute(query, params)
-            conn.commit()
+            if not self.in_transaction:
+                conn.commit()
             return cursor.lastrowid
         except Exception as e:
             logger.error(f"Error executing insert: {str(e)}")
             logger.error(f"Query: {query}")
             logger.error(f"Params: {params}")
-            conn.rollback()
+            if not self.in_transaction:  # Enclosing transaction() rolls back
+                conn.rollback()
             raise
-        finally:
-            cursor.close()
-    
+
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """Execute an UPDATE query and return the number of affected rows"""
         conn = self.get_connection()
-        cursor = conn.cursor()
+        cursor = self._cached_cursor(query)
         try:
             cursor.execute(query, params)
-            conn.commit()
+            if not self.in_transaction:
+                conn.commit()
             return cursor.rowcount
         except Exception as e:
             logger.error(f"Error executing update: {str(e)}")
             logger.error(f"Query: {query}")
             logger.error(f"Params: {params}")
-            conn.rollback()
+            if not self.in_transaction:  # Enclosing transaction() rolls back
+                conn.rollback()
             raise
-        finally:
-            cursor.close()
 
 
 class CategoryManager:
     """Manages categories in the inventory system"""
-    
+
+    # One canonical string object per statement: nothing rebuilds SQL text
+    # at call time, and every call site hands the statement caches the
+    # same object
+    _SQL_INSERT = "INSERT INTO categories (name, description) VALUES (?, ?)"
+    _SQL_GET_ALL = "SELECT * FROM categories ORDER BY name"
+    _SQL_GET = "SELECT * FROM categories WHERE category_id = ?"
+    # The IS NOT predicate (NULL-safe inequality) makes a no-op update
+    # match zero rows, so rewriting unchanged rows just to bump
+    # updated_at costs no page writes or WAL frames
+    _SQL_UPDATE = """
+        UPDATE categories
+        SET name = ?, description = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE category_id = ?
+          AND (name IS NOT ? OR description IS NOT ?)
+    """
+
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
-    
+        # Memoized point lookups; categories change rarely, so caching the
+        # row per ID removes a round-trip from every FK validation
+        self._row_cache: Dict[int, sqlite3.Row] = {}
+
     def add_category(self, name: str, description: Optional[str] = None) -> int:
         """Add a new category"""
-        query = """
-        INSERT INTO categories (name, description) 
-        VALUES (?, ?)
-        """
         params = (name, description)
         try:
-            category_id = self.db_manager.execute_insert(query, params)
+            category_id = self.db_manager.execute_insert(self._SQL_INSERT, params)
             logger.info(f"Added new category: {name} (ID: {category_id})")
             return category_id
         except Exception as e:
             logger.error(f"Failed to add category {name}: {str(e)}")
             raise
     
-    def get_all_categories(self) -> List[Dict[str, Any]]:
+    def get_all_categories(self) -> List[sqlite3.Row]:
         """Get all categories"""
-        query = "SELECT * FROM categories ORDER BY name"
-        return self.db_manager.execute_query(query)
-    
-    def get_category(self, category_id: int) -> Optional[Dict[str, Any]]:
+        return self.db_manager.execute_query(self._SQL_GET_ALL)
+
+    def get_category(self, category_id: int) -> Optional[sqlite3.Row]:
         """Get a category by ID"""
-        query = "SELECT * FROM categories WHERE category_id = ?"
-        params = (category_id,)
-        results = self.db_manager.execute_query(query, params)
-        return results[0] if results else None
-    
+        cached = self._row_cache.get(category_id)
+        if cached is not None:
+            return cached
+        row = self.db_manager.fetch_one(self._SQL_GET, (category_id,))
+        if row is not None:
+            self._row_cache[category_id] = row
+        return row
+
     def update_category(self, category_id: int, name: str, description: Optional[str] = None) -> bool:
-        """Update a category"""
-        query = """
-        UPDATE categories 
-        SET name = ?, description = ?, updated_at = CURRENT_TIMESTAMP 
-        WHERE category_id = ?
-        """
-        params = (name, description, category_id)
+        """Update a category. Returns False when nothing was written,
+        i.e. the ID does not exist or every value already matches."""
+        params = (name, description, category_id, name, description)
         try:
-            rows_affected = self.db_manager.execute_update(query, params)
+            rows_affected = self.db_manager.execute_update(self._SQL_UPDATE, params)
             success = rows_affected > 0
             if success:
+                self._row_cache.pop(category_id, None)
                 logger.info(f"Updated category ID {category_id}: {name}")
             else:
-                logger.warning(f"No category found with ID {category_id} to update")
+                logger.warning(f"Category ID {category_id} not updated (missing or unchanged)")
             return success
         except Exception as e:
             logger.error(f"Failed to update category {category_id}: {str(e)}")
@@ -209,57 +566,70 @@ class CategoryManager:
 
 class SupplierManager:
     """Manages suppliers in the inventory system"""
-    
+
+    _SQL_INSERT = """
+        INSERT INTO suppliers (name, contact_person, email, phone, address)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    _SQL_GET_ALL = "SELECT * FROM suppliers WHERE is_active = 1 ORDER BY name"
+    _SQL_GET = "SELECT * FROM suppliers WHERE supplier_id = ?"
+    # IS NOT comparisons skip the write entirely when no value changed
+    _SQL_UPDATE = """
+        UPDATE suppliers
+        SET name = ?, contact_person = ?, email = ?, phone = ?,
+            address = ?, is_active = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE supplier_id = ?
+          AND (name IS NOT ? OR contact_person IS NOT ? OR email IS NOT ?
+               OR phone IS NOT ? OR address IS NOT ? OR is_active IS NOT ?)
+    """
+
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
-    
+        # Memoized point lookups, invalidated when a supplier is updated
+        self._row_cache: Dict[int, sqlite3.Row] = {}
+
     def add_supplier(self, name: str, contact_person: Optional[str] = None, 
                     email: Optional[str] = None, phone: Optional[str] = None, 
                     address: Optional[str] = None) -> int:
         """Add a new supplier"""
-        query = """
-        INSERT INTO suppliers (name, contact_person, email, phone, address) 
-        VALUES (?, ?, ?, ?, ?)
-        """
         params = (name, contact_person, email, phone, address)
         try:
-            supplier_id = self.db_manager.execute_insert(query, params)
+            supplier_id = self.db_manager.execute_insert(self._SQL_INSERT, params)
             logger.info(f"Added new supplier: {name} (ID: {supplier_id})")
             return supplier_id
         except Exception as e:
             logger.error(f"Failed to add supplier {name}: {str(e)}")
             raise
     
-    def get_all_suppliers(self) -> List[Dict[str, Any]]:
+    def get_all_suppliers(self) -> List[sqlite3.Row]:
         """Get all suppliers"""
-        query = "SELECT * FROM suppliers WHERE is_active = 1 ORDER BY name"
-        return self.db_manager.execute_query(query)
-    
-    def get_supplier(self, supplier_id: int) -> Optional[Dict[str, Any]]:
+        return self.db_manager.execute_query(self._SQL_GET_ALL)
+
+    def get_supplier(self, supplier_id: int) -> Optional[sqlite3.Row]:
         """Get a supplier by ID"""
-        query = "SELECT * FROM suppliers WHERE supplier_id = ?"
-        params = (supplier_id,)
-        results = self.db_manager.execute_query(query, params)
-        return results[0] if results else None
+        cached = self._row_cache.get(supplier_id)
+        if cached is not None:
+            return cached
+        row = self.db_manager.fetch_one(self._SQL_GET, (supplier_id,))
+        if row is not None:
+            self._row_cache[supplier_id] = row
+        return row
     
     def update_supplier(self, supplier_id: int, name: str, contact_person: Optional[str] = None,
                        email: Optional[str] = None, phone: Optional[str] = None,
                        address: Optional[str] = None, is_active: bool = True) -> bool:
-        """Update a supplier"""
-        query = """
-        UPDATE suppliers 
-        SET name = ?, contact_person = ?, email = ?, phone = ?, 
-            address = ?, is_active = ?, updated_at = CURRENT_TIMESTAMP 
-        WHERE supplier_id = ?
-        """
-        params = (name, contact_person, email, phone, address, 1 if is_active else 0, supplier_id)
+        """Update a supplier. Returns False when nothing was written,
+        i.e. the ID does not exist or every value already matches."""
+        values = (name, contact_person, email, phone, address, 1 if is_active else 0)
+        params = values + (supplier_id,) + values
         try:
-            rows_affected = self.db_manager.execute_update(query, params)
+            rows_affected = self.db_manager.execute_update(self._SQL_UPDATE, params)
             success = rows_affected > 0
             if success:
+                self._row_cache.pop(supplier_id, None)
                 logger.info(f"Updated supplier ID {supplier_id}: {name}")
             else:
-                logger.warning(f"No supplier found with ID {supplier_id} to update")
+                logger.warning(f"Supplier ID {supplier_id} not updated (missing or unchanged)")
             return success
         except Exception as e:
             logger.error(f"Failed to update supplier {supplier_id}: {str(e)}")
@@ -268,359 +638,604 @@ class SupplierManager:
 
 class LocationManager:
     """Manages locations in the inventory system"""
-    
+
+    _SQL_INSERT = "INSERT INTO locations (name, description) VALUES (?, ?)"
+    _SQL_GET_ALL = "SELECT * FROM locations WHERE is_active = 1 ORDER BY name"
+    _SQL_GET = "SELECT * FROM locations WHERE location_id = ?"
+
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
-    
+        # Memoized point lookups; locations have no update path, so cached
+        # rows stay valid for the life of the process
+        self._row_cache: Dict[int, sqlite3.Row] = {}
+
     def add_location(self, name: str, description: Optional[str] = None) -> int:
         """Add a new location"""
-        query = """
-        INSERT INTO locations (name, description) 
-        VALUES (?, ?)
-        """
         params = (name, description)
         try:
-            location_id = self.db_manager.execute_insert(query, params)
+            location_id = self.db_manager.execute_insert(self._SQL_INSERT, params)
             logger.info(f"Added new location: {name} (ID: {location_id})")
             return location_id
         except Exception as e:
             logger.error(f"Failed to add location {name}: {str(e)}")
             raise
     
-    def get_all_locations(self) -> List[Dict[str, Any]]:
+    def get_all_locations(self) -> List[sqlite3.Row]:
         """Get all locations"""
-        query = "SELECT * FROM locations WHERE is_active = 1 ORDER BY name"
-        return self.db_manager.execute_query(query)
-    
-    def get_location(self, location_id: int) -> Optional[Dict[str, Any]]:
+        return self.db_manager.execute_query(self._SQL_GET_ALL)
+
+    def get_location(self, location_id: int) -> Optional[sqlite3.Row]:
         """Get a location by ID"""
-        query = "SELECT * FROM locations WHERE location_id = ?"
-        params = (location_id,)
-        results = self.db_manager.execute_query(query, params)
-        return results[0] if results else None
+        cached = self._row_cache.get(location_id)
+        if cached is not None:
+            return cached
+        row = self.db_manager.fetch_one(self._SQL_GET, (location_id,))
+        if row is not None:
+            self._row_cache[location_id] = row
+        return row
 
 
 class ProductManager:
     """Manages products in the inventory system"""
-    
+
+    # Maps requestable column names to their SQL expressions, so callers can
+    # project only the columns they render instead of fetching every field
+    PRODUCT_COLUMNS = {
+        "product_id": "p.product_id",
+        "sku": "p.sku",
+        "name": "p.name",
+        "description": "p.description",
+        "category_id": "p.category_id",
+        "supplier_id": "p.supplier_id",
+        "unit_price": "p.unit_price",
+        "min_stock_level": "p.min_stock_level",
+        "max_stock_level": "p.max_stock_level",
+        "is_active": "p.is_active",
+        "category_name": "c.name as category_name",
+        "supplier_name": "s.name as supplier_name",
+    }
+
+    _SQL_INSERT = """
+        INSERT INTO products (
+            sku, name, description, category_id, supplier_id,
+            unit_price, min_stock_level, max_stock_level, is_active
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _SQL_GET = """
+        SELECT p.*, c.name as category_name, s.name as supplier_name
+        FROM products p
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
+        WHERE p.product_id = ?
+    """
+    _SQL_GET_BY_SKU = """
+        SELECT p.*, c.name as category_name, s.name as supplier_name
+        FROM products p
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
+        WHERE p.sku = ?
+    """
+    # IS NOT comparisons make a value-for-value rewrite match zero rows;
+    # besides the saved page writes this keeps no-op updates from firing
+    # the FTS sync triggers
+    _SQL_UPDATE = """
+        UPDATE products
+        SET sku = ?, name = ?, description = ?, category_id = ?,
+            supplier_id = ?, unit_price = ?, min_stock_level = ?,
+            max_stock_level = ?, is_active = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE product_id = ?
+          AND (sku IS NOT ? OR name IS NOT ? OR description IS NOT ?
+               OR category_id IS NOT ? OR supplier_id IS NOT ?
+               OR unit_price IS NOT ? OR min_stock_level IS NOT ?
+               OR max_stock_level IS NOT ? OR is_active IS NOT ?)
+    """
+    _SQL_SEARCH_FTS = """
+        SELECT p.*, c.name as category_name, s.name as supplier_name
+        FROM products_fts f
+        JOIN products p ON p.product_id = f.rowid
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
+        WHERE products_fts MATCH ? AND p.is_active = 1
+        ORDER BY p.name
+    """
+    _SQL_SEARCH_LIKE = """
+        SELECT p.*, c.name as category_name, s.name as supplier_name
+        FROM products p
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
+        WHERE (p.name LIKE ? OR p.sku LIKE ?) AND p.is_active = 1
+        ORDER BY p.name
+    """
+
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
-    
+
     def add_product(self, product: Product) -> int:
         """Add a new product"""
-        query = """
-        INSERT INTO products (
-            sku, name, description, category_id, supplier_id, 
-            unit_price, min_stock_level, max_stock_level, is_active
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
         params = (
             product.sku, product.name, product.description, product.category_id,
             product.supplier_id, product.unit_price, product.min_stock_level,
             product.max_stock_level, 1 if product.is_active else 0
         )
         try:
-            product_id = self.db_manager.execute_insert(query, params)
+            product_id = self.db_manager.execute_insert(self._SQL_INSERT, params)
             logger.info(f"Added new product: {product.name} (ID: {product_id})")
             return product_id
         except Exception as e:
             logger.error(f"Failed to add product {product.name}: {str(e)}")
             raise
-    
-    def get_all_products(self) -> List[Dict[str, Any]]:
-        """Get all products"""
-        query = """
-        SELECT p.*, c.name as category_name, s.name as supplier_name
+
+    def add_products_bulk(self, products: List[Product]) -> int:
+        """Add a batch of products in a single database transaction.
+
+        One executemany and one commit instead of a statement and an fsync
+        per product, which is what makes bulk imports practical. Returns
+        the number of products added; the whole batch is rolled back if
+        any row fails.
+        """
+        products = list(products)
+        if not products:
+            return 0
+
+        try:
+            with self.db_manager.transaction() as conn:
+                conn.executemany(
+                    self._SQL_INSERT,
+                    [
+                        (
+                            p.sku, p.name, p.description, p.category_id,
+                            p.supplier_id, p.unit_price, p.min_stock_level,
+                            p.max_stock_level, 1 if p.is_active else 0
+                        )
+                        for p in products
+                    ]
+                )
+            logger.info(f"Added batch of {len(products)} products")
+            return len(products)
+        except Exception as e:
+            logger.error(f"Failed to add product batch: {str(e)}")
+            raise
+
+    def get_all_products(self, columns: Optional[Tuple[str, ...]] = None,
+                         limit: Optional[int] = None,
+                         offset: int = 0) -> List[sqlite3.Row]:
+        """Get all products.
+
+        columns optionally restricts the projection to the named fields
+        (see PRODUCT_COLUMNS); limit/offset page through the catalog so
+        callers rendering a screenful don't fetch the whole table.
+        """
+        if columns:
+            for column in columns:
+                if column not in self.PRODUCT_COLUMNS:
+                    raise ValueError(f"Unknown product column: {column}")
+            select_clause = ", ".join(self.PRODUCT_COLUMNS[c] for c in columns)
+        else:
+            select_clause = "p.*, c.name as category_name, s.name as supplier_name"
+
+        query = f"""
+        SELECT {select_clause}
         FROM products p
         LEFT JOIN categories c ON p.category_id = c.category_id
         LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
         WHERE p.is_active = 1
         ORDER BY p.name
         """
-        return self.db_manager.execute_query(query)
+        params = ()
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params = (limit, offset)
+        return self.db_manager.execute_query(query, params)
     
-    def get_product(self, product_id: int) -> Optional[Dict[str, Any]]:
+    def get_product(self, product_id: int) -> Optional[sqlite3.Row]:
         """Get a product by ID"""
-        query = """
-        SELECT p.*, c.name as category_name, s.name as supplier_name
-        FROM products p
-        LEFT JOIN categories c ON p.category_id = c.category_id
-        LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
-        WHERE p.product_id = ?
-        """
-        params = (product_id,)
-        results = self.db_manager.execute_query(query, params)
-        return results[0] if results else None
-    
-    def get_product_by_sku(self, sku: str) -> Optional[Dict[str, Any]]:
+        return self.db_manager.fetch_one(self._SQL_GET, (product_id,))
+
+    def get_product_by_sku(self, sku: str) -> Optional[sqlite3.Row]:
         """Get a product by SKU"""
-        query = """
-        SELECT p.*, c.name as category_name, s.name as supplier_name
-        FROM products p
-        LEFT JOIN categories c ON p.category_id = c.category_id
-        LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
-        WHERE p.sku = ?
-        """
-        params = (sku,)
-        results = self.db_manager.execute_query(query, params)
-        return results[0] if results else None
-    
+        return self.db_manager.fetch_one(self._SQL_GET_BY_SKU, (sku,))
+
     def update_product(self, product: Product) -> bool:
-        """Update a product"""
-        query = """
-        UPDATE products 
-        SET sku = ?, name = ?, description = ?, category_id = ?,
-            supplier_id = ?, unit_price = ?, min_stock_level = ?,
-            max_stock_level = ?, is_active = ?, updated_at = CURRENT_TIMESTAMP
-        WHERE product_id = ?
-        """
-        params = (
+        """Update a product. Returns False when nothing was written,
+        i.e. the ID does not exist or every value already matches."""
+        values = (
             product.sku, product.name, product.description, product.category_id,
             product.supplier_id, product.unit_price, product.min_stock_level,
-            product.max_stock_level, 1 if product.is_active else 0, product.product_id
+            product.max_stock_level, 1 if product.is_active else 0
         )
+        params = values + (product.product_id,) + values
         try:
-            rows_affected = self.db_manager.execute_update(query, params)
+            rows_affected = self.db_manager.execute_update(self._SQL_UPDATE, params)
             success = rows_affected > 0
             if success:
                 logger.info(f"Updated product ID {product.product_id}: {product.name}")
             else:
-                logger.warning(f"No product found with ID {product.product_id} to update")
+                logger.warning(f"Product ID {product.product_id} not updated (missing or unchanged)")
             return success
         except Exception as e:
             logger.error(f"Failed to update product {product.product_id}: {str(e)}")
             raise
     
-    def search_products(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search for products by name or SKU"""
-        query = """
-        SELECT p.*, c.name as category_name, s.name as supplier_name
-        FROM products p
-        LEFT JOIN categories c ON p.category_id = c.category_id
-        LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
-        WHERE (p.name LIKE ? OR p.sku LIKE ?) AND p.is_active = 1
-        ORDER BY p.name
+    @staticmethod
+    def _fts_match_expression(search_term: str) -> str:
+        """Turn raw user input into a safe FTS5 MATCH expression.
+
+        Each whitespace-separated token becomes a quoted prefix query
+        ("lap"* matches Laptop), so terms containing FTS5 operator
+        characters like - or " search literally instead of raising a
+        syntax error, and multiple tokens AND together.
         """
-        search_pattern = f"%{search_term}%"
-        params = (search_pattern, search_pattern)
+        return " ".join(
+            '"' + token.replace('"', '""') + '"*'
+            for token in search_term.split()
+        )
+
+    def search_products(self, search_term: str) -> List[sqlite3.Row]:
+        """Search for products by name, SKU, or description"""
+        match = (self._fts_match_expression(search_term)
+                 if self.db_manager.fts_enabled else "")
+        if match:
+            query = self._SQL_SEARCH_FTS
+            params = (match,)
+        else:
+            # Blank input yields no MATCH terms, which FTS5 rejects as a
+            # syntax error; the LIKE scan keeps the baseline behavior of
+            # returning every active product for an empty term
+            query = self._SQL_SEARCH_LIKE
+            search_pattern = f"%{search_term}%"
+            params = (search_pattern, search_pattern)
         return self.db_manager.execute_query(query, params)
 
 
 class InventoryManager:
     """Manages inventory levels and transactions"""
-    
+
+    # Every filter combination pre-built once at class definition, so each
+    # variant is a fixed SQL string the statement caches can latch onto
+    # instead of a fresh string assembled per call
+    _INVENTORY_SQL = {
+        (has_product, has_location): " ".join(
+            [
+                "SELECT i.*, p.name as product_name, p.sku, l.name as location_name",
+                "FROM inventory i",
+                "JOIN products p ON i.product_id = p.product_id",
+                "JOIN locations l ON i.location_id = l.location_id",
+                "WHERE 1=1",
+            ]
+            + (["AND i.product_id = ?"] if has_product else [])
+            + (["AND i.location_id = ?"] if has_location else [])
+            + ["ORDER BY p.name, l.name"]
+        )
+        for has_product in (False, True)
+        for has_location in (False, True)
+    }
+
+    _HISTORY_SQL = {
+        (has_product, has_location, has_start, has_end): " ".join(
+            [
+                "SELECT t.*, p.name as product_name, p.sku, l.name as location_name, tt.name as transaction_type",
+                "FROM inventory_transactions t",
+                "JOIN products p ON t.product_id = p.product_id",
+                "JOIN locations l ON t.location_id = l.location_id",
+                "JOIN transaction_types tt ON t.transaction_type_id = tt.transaction_type_id",
+                "WHERE 1=1",
+            ]
+            + (["AND t.product_id = ?"] if has_product else [])
+            + (["AND t.location_id = ?"] if has_location else [])
+            + (["AND t.transaction_date >= ?"] if has_start else [])
+            + (["AND t.transaction_date <= ?"] if has_end else [])
+            + ["ORDER BY t.transaction_date DESC", "LIMIT ?"]
+        )
+        for has_product in (False, True)
+        for has_location in (False, True)
+        for has_start in (False, True)
+        for has_end in (False, True)
+    }
+
+    _SQL_GET_QUANTITY = """
+        SELECT quantity FROM inventory
+        WHERE product_id = ? AND location_id = ?
+    """
+    # COALESCE lets SQLite stamp the current local time when the caller
+    # passes no timestamp, replacing a strftime() call per row; the format
+    # matches what the Python side used to produce
+    _SQL_SET_QUANTITY = """
+        INSERT INTO inventory (product_id, location_id, quantity, last_counted_at)
+        VALUES (?, ?, ?, COALESCE(?, datetime('now', 'localtime')))
+        ON CONFLICT(product_id, location_id) DO UPDATE SET
+            quantity = excluded.quantity,
+            last_counted_at = excluded.last_counted_at,
+            updated_at = CURRENT_TIMESTAMP
+    """
+    _SQL_VALIDATE = """
+        SELECT
+            (SELECT name FROM products WHERE product_id = ?) AS product_name,
+            (SELECT name FROM locations WHERE location_id = ?) AS location_name
+    """
+    _SQL_INSERT_TRANSACTION = """
+        INSERT INTO inventory_transactions (
+            product_id, location_id, transaction_type_id, quantity,
+            transaction_date, reference_number, notes, created_by
+        ) VALUES (?, ?, ?, ?, COALESCE(?, datetime('now', 'localtime')), ?, ?, ?)
+    """
+    _SQL_APPLY_DELTA = """
+        INSERT INTO inventory (product_id, location_id, quantity)
+        VALUES (?, ?, ?)
+        ON CONFLICT(product_id, location_id) DO UPDATE SET
+            quantity = quantity + excluded.quantity,
+            updated_at = CURRENT_TIMESTAMP
+    """
+    _SQL_APPLY_DELTA_RETURNING = _SQL_APPLY_DELTA + "    RETURNING quantity\n"
+    _SQL_LOW_STOCK = """
+        SELECT
+            p.product_id,
+            p.sku,
+            p.name,
+            c.name AS category,
+            s.name AS supplier,
+            SUM(i.quantity) AS total_quantity,
+            p.min_stock_level,
+            p.max_stock_level,
+            (p.min_stock_level - SUM(i.quantity)) AS quantity_to_order
+        FROM products p
+        JOIN inventory i ON p.product_id = i.product_id
+        JOIN categories c ON p.category_id = c.category_id
+        JOIN suppliers s ON p.supplier_id = s.supplier_id
+        WHERE p.is_active = 1
+        GROUP BY p.product_id
+        HAVING SUM(i.quantity) < p.min_stock_level
+        ORDER BY quantity_to_order DESC
+    """
+    _SQL_LOW_STOCK_TOP = _SQL_LOW_STOCK + "    LIMIT ?\n"
+
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
-    
-    def get_inventory_levels(self, product_id: Optional[int] = None, 
-                             location_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Memoized transaction_types table (type id -> affects_inventory);
+        # the table is seeded by the schema and effectively immutable
+        self._tt_cache: Optional[Dict[int, int]] = None
+
+    def _affects_inventory(self, transaction_type_id: int) -> int:
+        """Look up a transaction type's inventory effect from the cache.
+
+        Loads the whole transaction_types table on first use; on a miss the
+        table is reloaded once so types added at runtime are still found.
+        Raises ValueError for an unknown transaction type ID.
+        """
+        if self._tt_cache is None or transaction_type_id not in self._tt_cache:
+            self._tt_cache = {
+                row["transaction_type_id"]: row["affects_inventory"]
+                for row in self.db_manager.execute_query(
+                    "SELECT transaction_type_id, affects_inventory FROM transaction_types"
+                )
+            }
+        if transaction_type_id not in self._tt_cache:
+            raise ValueError(f"Invalid transaction type ID: {transaction_type_id}")
+        return self._tt_cache[transaction_type_id]
+
+
+    def _build_inventory_query(self, product_id: Optional[int],
+                               location_id: Optional[int]) -> Tuple[str, tuple]:
+        """Look up the precompiled inventory query for the given filters"""
+        query = self._INVENTORY_SQL[(product_id is not None, location_id is not None)]
+        params = tuple(p for p in (product_id, location_id) if p is not None)
+        return query, params
+
+    def get_inventory_levels(self, product_id: Optional[int] = None,
+                             location_id: Optional[int] = None) -> List[sqlite3.Row]:
         """Get current inventory levels, optionally filtered by product or location"""
-        query_parts = [
-            "SELECT i.*, p.name as product_name, p.sku, l.name as location_name",
-            "FROM inventory i",
-            "JOIN products p ON i.product_id = p.product_id",
-            "JOIN locations l ON i.location_id = l.location_id",
-            "WHERE 1=1"
-        ]
-        params = []
-        
-        if product_id is not None:
-            query_parts.append("AND i.product_id = ?")
-            params.append(product_id)
-        
-        if location_id is not None:
-            query_parts.append("AND i.location_id = ?")
-            params.append(location_id)
-        
-        query_parts.append("ORDER BY p.name, l.name")
-        query = " ".join(query_parts)
-        
-        return self.db_manager.execute_query(query, tuple(params))
+        query, params = self._build_inventory_query(product_id, location_id)
+        return self.db_manager.execute_query(query, params)
+
+    def iter_inventory_levels(self, product_id: Optional[int] = None,
+                              location_id: Optional[int] = None,
+                              batch_size: int = 256):
+        """Yield inventory levels without materializing the full result list"""
+        query, params = self._build_inventory_query(product_id, location_id)
+        return self.db_manager.execute_query_iter(query, params, batch_size)
     
     def get_product_quantity(self, product_id: int, location_id: int) -> int:
         """Get the current quantity of a product at a specific location"""
-        query = """
-        SELECT quantity FROM inventory
-        WHERE product_id = ? AND location_id = ?
-        """
-        params = (product_id, location_id)
-        results = self.db_manager.execute_query(query, params)
-        return results[0]["quantity"] if results else 0
+        row = self.db_manager.fetch_one(self._SQL_GET_QUANTITY, (product_id, location_id))
+        return row["quantity"] if row is not None else 0
     
-    def update_inventory_quantity(self, product_id: int, location_id: int, 
+    def update_inventory_quantity(self, product_id: int, location_id: int,
                                  new_quantity: int, counted_at: Optional[str] = None) -> bool:
         """Update the inventory quantity for a product at a specific location"""
-        # Check if record exists
-        current_quantity = self.get_product_quantity(product_id, location_id)
-        
-        if counted_at is None:
-            counted_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        if current_quantity > 0:  # Record exists, update it
-            query = """
-            UPDATE inventory
-            SET quantity = ?, last_counted_at = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE product_id = ? AND location_id = ?
-            """
-            params = (new_quantity, counted_at, product_id, location_id)
-            try:
-                self.db_manager.execute_update(query, params)
-                logger.info(f"Updated inventory for product ID {product_id} at location {location_id}: {new_quantity}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to update inventory quantity: {str(e)}")
-                raise
-        else:  # Record doesn't exist, insert new one
-            query = """
-            INSERT INTO inventory (product_id, location_id, quantity, last_counted_at)
-            VALUES (?, ?, ?, ?)
-            """
-            params = (product_id, location_id, new_quantity, counted_at)
-            try:
-                self.db_manager.execute_insert(query, params)
-                logger.info(f"Created inventory record for product ID {product_id} at location {location_id}: {new_quantity}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to create inventory record: {str(e)}")
-                raise
+        # One upsert instead of a SELECT to pick between UPDATE and INSERT.
+        # This also fixes the old check's bug where a row holding a
+        # quantity of zero was treated as missing and a duplicate inserted.
+        params = (product_id, location_id, new_quantity, counted_at)
+        try:
+            self.db_manager.execute_insert(self._SQL_SET_QUANTITY, params)
+            logger.info(f"Set inventory for product ID {product_id} at location {location_id}: {new_quantity}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update inventory quantity: {str(e)}")
+            raise
     
-    def record_transaction(self, transaction: InventoryTransaction) -> int:
-        """Record an inventory transaction and update inventory levels"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
+    def validate_product_location(self, product_id: int,
+                                  location_id: int) -> sqlite3.Row:
+        """Check a product and a location in a single round-trip.
+
+        Returns a row with product_name and location_name; either is None
+        when the corresponding ID does not exist. Collapses the two
+        pre-transaction validation queries into one statement.
+        """
+        return self.db_manager.fetch_one(self._SQL_VALIDATE, (product_id, location_id))
+
+    def record_transaction(self, transaction: InventoryTransaction) -> Tuple[int, int]:
+        """Record an inventory transaction and update inventory levels.
+
+        Returns (transaction_id, new_quantity) where new_quantity is the
+        resulting stock level at the transaction's location, so callers can
+        show the updated balance without issuing another query.
+        """
+        # Get the transaction type's effect on inventory from the cache
+        affects_inventory = self._affects_inventory(transaction.transaction_type_id)
+
         try:
-            # Start a transaction
-            cursor.execute("BEGIN TRANSACTION")
-            
-            # Get the transaction type and its effect on inventory
-            cursor.execute(
-                "SELECT affects_inventory FROM transaction_types WHERE transaction_type_id = ?", 
-                (transaction.transaction_type_id,)
-            )
-            result = cursor.fetchone()
-            if not result:
-                raise ValueError(f"Invalid transaction type ID: {transaction.transaction_type_id}")
-            
-            affects_inventory = result["affects_inventory"]
-            
-            # Insert the transaction record
-            if transaction.transaction_date is None:
-                transaction.transaction_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                
-            cursor.execute(
-                """
-                INSERT INTO inventory_transactions (
-                    product_id, location_id, transaction_type_id, quantity,
-                    transaction_date, reference_number, notes, created_by
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    transaction.product_id, transaction.location_id, 
-                    transaction.transaction_type_id, transaction.quantity,
-                    transaction.transaction_date, transaction.reference_number,
-                    transaction.notes, transaction.created_by
-                )
-            )
-            
-            transaction_id = cursor.lastrowid
-            
-            # Update inventory levels if the transaction affects inventory
-            if affects_inventory != 0:
-                # Calculate the inventory change (positive for increase, negative for decrease)
-                inventory_change = transaction.quantity * affects_inventory
-                
-                # Check if there's an existing inventory record
-                cursor.execute(
-                    "SELECT inventory_id, quantity FROM inventory WHERE product_id = ? AND location_id = ?",
-                    (transaction.product_id, transaction.location_id)
+            with self.db_manager.transaction() as conn:
+                # Insert the transaction record; a None transaction_date is
+                # stamped by the COALESCE in the statement
+                cursor = conn.execute(
+                    self._SQL_INSERT_TRANSACTION,
+                    (
+                        transaction.product_id, transaction.location_id,
+                        transaction.transaction_type_id, transaction.quantity,
+                        transaction.transaction_date, transaction.reference_number,
+                        transaction.notes, transaction.created_by
+                    )
                 )
-                inventory_record = cursor.fetchone()
-                
-                if inventory_record:
-                    # Update existing inventory record
-                    new_quantity = inventory_record["quantity"] + inventory_change
-                    
-                    # Prevent negative inventory if configured to do so
-                    # For this simple implementation, we'll allow negative inventory
+
+                transaction_id = cursor.lastrowid
+
+                # Update inventory levels if the transaction affects inventory
+                new_quantity = None
+                if affects_inventory != 0:
+                    # Calculate the inventory change (positive for increase, negative for decrease)
+                    inventory_change = transaction.quantity * affects_inventory
+
+                    # One upsert replaces the old select-then-branch: the
+                    # UNIQUE(product_id, location_id) constraint decides
+                    # whether the row is created or incremented, and
+                    # RETURNING hands back the resulting balance without
+                    # another query. Negative inventory is still allowed,
+                    # as before.
                     cursor.execute(
-                        """
-                        UPDATE inventory
-                        SET quantity = ?, updated_at = CURRENT_TIMESTAMP
-                        WHERE product_id = ? AND location_id = ?
-                        """,
-                        (new_quantity, transaction.product_id, transaction.location_id)
+                        self._SQL_APPLY_DELTA_RETURNING,
+                        (transaction.product_id, transaction.location_id, inventory_change)
                     )
+                    new_quantity = cursor.fetchone()["quantity"]
                 else:
-                    # Create a new inventory record
+                    # No inventory effect; report the unchanged balance
                     cursor.execute(
-                        """
-                        INSERT INTO inventory (product_id, location_id, quantity)
-                        VALUES (?, ?, ?)
-                        """,
-                        (transaction.product_id, transaction.location_id, inventory_change)
+                        self._SQL_GET_QUANTITY,
+                        (transaction.product_id, transaction.location_id)
                     )
-            
-            # Commit the transaction
-            conn.commit()
-            
-            logger.info(f"Recorded transaction ID {transaction_id} for product {transaction.product_id}")
-            return transaction_id
-        
+                    row = cursor.fetchone()
+                    new_quantity = row["quantity"] if row else 0
+
+            # Gate the f-string so bulk callers running at WARNING don't pay
+            # for interpolation on every transaction
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Recorded transaction ID {transaction_id} for product {transaction.product_id}")
+            return transaction_id, new_quantity
+
         except Exception as e:
-            # Rollback in case of error
-            conn.rollback()
             logger.error(f"Failed to record transaction: {str(e)}")
             raise
-        finally:
-            cursor.close()
     
-    def get_transaction_history(self, product_id: Optional[int] = None, 
+    def _build_history_query(self, product_id: Optional[int],
+                             location_id: Optional[int],
+                             start_date: Optional[str],
+                             end_date: Optional[str],
+                             limit: int) -> Tuple[str, tuple]:
+        """Look up the precompiled history query for the given filters.
+
+        The row limit is a bound parameter rather than interpolated text,
+        so varying it doesn't produce a new SQL string.
+        """
+        query = self._HISTORY_SQL[(product_id is not None, location_id is not None,
+                                   start_date is not None, end_date is not None)]
+        params = tuple(p for p in (product_id, location_id, start_date, end_date)
+                       if p is not None) + (limit,)
+        return query, params
+
+    def get_transaction_history(self, product_id: Optional[int] = None,
                                location_id: Optional[int] = None,
                                start_date: Optional[str] = None,
                                end_date: Optional[str] = None,
-                               limit: int = 100) -> List[Dict[str, Any]]:
+                               limit: int = 100) -> List[sqlite3.Row]:
         """Get transaction history, optionally filtered by product, location, and date range"""
-        query_parts = [
-            "SELECT t.*, p.name as product_name, p.sku, l.name as location_name, tt.name as transaction_type",
-            "FROM inventory_transactions t",
-            "JOIN products p ON t.product_id = p.product_id",
-            "JOIN locations l ON t.location_id = l.location_id",
-            "JOIN transaction_types tt ON t.transaction_type_id = tt.transaction_type_id",
-            "WHERE 1=1"
-        ]
-        params = []
-        
-        if product_id is not None:
-            query_parts.append("AND t.product_id = ?")
-            params.append(product_id)
-        
-        if location_id is not None:
-            query_parts.append("AND t.location_id = ?")
-            params.append(location_id)
-        
-        if start_date is not None:
-            query_parts.append("AND t.transaction_date >= ?")
-            params.append(start_date)
-        
-        if end_date is not None:
-            query_parts.append("AND t.transaction_date <= ?")
-            params.append(end_date)
-        
-        query_parts.append("ORDER BY t.transaction_date DESC")
-        query_parts.append(f"LIMIT {limit}")
-        
-        query = " ".join(query_parts)
-        
-        return self.db_manager.execute_query(query, tuple(params))
+        query, params = self._build_history_query(
+            product_id, location_id, start_date, end_date, limit
+        )
+        return self.db_manager.execute_query(query, params)
+
+    def iter_transaction_history(self, product_id: Optional[int] = None,
+                                 location_id: Optional[int] = None,
+                                 start_date: Optional[str] = None,
+                                 end_date: Optional[str] = None,
+                                 limit: int = 100,
+                                 batch_size: int = 256):
+        """Yield transaction history rows without materializing the full list"""
+        query, params = self._build_history_query(
+            product_id, location_id, start_date, end_date, limit
+        )
+        return self.db_manager.execute_query_iter(query, params, batch_size)
     
-    def get_low_stock_items(self) -> List[Dict[str, Any]]:
-        """Get products that are below their minimum stock level"""
-        query = """
-        SELECT * FROM vw_reorder_list
-        ORDER BY quantity_to_order DESC
+    def record_transactions(self, transactions: List[InventoryTransaction]) -> int:
+        """Record a batch of inventory transactions in one database transaction.
+
+        All transaction rows are inserted with a single executemany and the
+        inventory effects are aggregated per product/location before being
+        applied, so a batch of N transactions costs a handful of statements
+        and one commit instead of N round-trips and N fsyncs. Returns the
+        number of transactions recorded.
         """
-        return self.db_manager.execute_query(query)
+        transactions = list(transactions)
+        if not transactions:
+            return 0
+
+        # Resolve the inventory effect of every distinct transaction type
+        # from the memoized transaction_types table (validates the IDs too)
+        affects = {
+            type_id: self._affects_inventory(type_id)
+            for type_id in {t.transaction_type_id for t in transactions}
+        }
+
+        try:
+            with self.db_manager.transaction() as conn:
+                # Insert all transaction records in one executemany; rows
+                # without a transaction_date are stamped by the COALESCE
+                conn.executemany(
+                    self._SQL_INSERT_TRANSACTION,
+                    [
+                        (
+                            t.product_id, t.location_id, t.transaction_type_id,
+                            t.quantity, t.transaction_date,
+                            t.reference_number, t.notes, t.created_by
+                        )
+                        for t in transactions
+                    ]
+                )
+
+                # Aggregate the net inventory change per product/location
+                deltas: Dict[Tuple[int, int], int] = {}
+                for t in transactions:
+                    change = t.quantity * affects[t.transaction_type_id]
+                    if change != 0:
+                        key = (t.product_id, t.location_id)
+                        deltas[key] = deltas.get(key, 0) + change
+
+                # Apply each net change in a single executemany upsert; the
+                # UNIQUE(product_id, location_id) constraint resolves
+                # whether a row is created or incremented
+                conn.executemany(
+                    self._SQL_APPLY_DELTA,
+                    [
+                        (product_id, location_id, change)
+                        for (product_id, location_id), change in deltas.items()
+                    ]
+                )
+
+            logger.info(f"Recorded batch of {len(transactions)} transactions")
+            return len(transactions)
+
+        except Exception as e:
+            logger.error(f"Failed to record transaction batch: {str(e)}")
+            raise
+
+    def get_low_stock_items(self, limit: Optional[int] = None) -> List[sqlite3.Row]:
+        """Get products that are below their minimum stock level.
+
+        Pass limit to get only the N most urgent shortfalls.
+        """
+        # Single aggregation pass; the (product_id, quantity) index on
+        # inventory makes the per-product SUM an index-only scan
+        if limit is not None:
+            return self.db_manager.execute_query(self._SQL_LOW_STOCK_TOP, (limit,))
+        return self.db_manager.execute_query(self._SQL_LOW_STOCK)
 
 
 class InventorySystem:
@@ -636,6 +1251,67 @@ class InventorySystem:
         self.inventory_manager = InventoryManager(self.db_manager)
         logger.info("Inventory Management System initialized")
     
+    def add_product_with_initial_stock(self, product: Product, location_id: int,
+                                       quantity: int,
+                                       reference_number: Optional[str] = None,
+                                       notes: Optional[str] = None,
+                                       created_by: Optional[str] = None) -> Tuple[int, int]:
+        """Add a product and record its initial stock in one transaction.
+
+        The product insert, the purchase transaction, and the inventory
+        record are committed together -- one round-trip sequence and one
+        fsync instead of two separate auto-committed writes, and no
+        half-created product if the stock insert fails.
+        Returns (product_id, transaction_id).
+        """
+        try:
+            with self.db_manager.transaction() as conn:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO products (
+                        sku, name, description, category_id, supplier_id,
+                        unit_price, min_stock_level, max_stock_level, is_active
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        product.sku, product.name, product.description,
+                        product.category_id, product.supplier_id, product.unit_price,
+                        product.min_stock_level, product.max_stock_level,
+                        1 if product.is_active else 0
+                    )
+                )
+                product_id = cursor.lastrowid
+
+                cursor.execute(
+                    """
+                    INSERT INTO inventory_transactions (
+                        product_id, location_id, transaction_type_id, quantity,
+                        transaction_date, reference_number, notes, created_by
+                    ) VALUES (?, ?, 1, ?, datetime('now', 'localtime'), ?, ?, ?)
+                    """,  # transaction type 1 = Purchase
+                    (
+                        product_id, location_id, quantity,
+                        reference_number, notes, created_by
+                    )
+                )
+                transaction_id = cursor.lastrowid
+
+                # The product is brand new, so this is always a fresh record
+                cursor.execute(
+                    "INSERT INTO inventory (product_id, location_id, quantity) VALUES (?, ?, ?)",
+                    (product_id, location_id, quantity)
+                )
+
+            logger.info(
+                f"Added new product: {product.name} (ID: {product_id}) "
+                f"with initial stock of {quantity} at location {location_id}"
+            )
+            return product_id, transaction_id
+
+        except Exception as e:
+            logger.error(f"Failed to add product {product.name} with initial stock: {str(e)}")
+            raise
+
     def close(self):
         """Close the inventory system and release resources"""
         self.db_manager.close_connection()
@@ -649,111 +1325,114 @@ def demo_inventory_system():
     inventory_system = InventorySystem()
     
     try:
-        # Add some categories
-        electronics_id = inventory_system.category_manager.add_category(
-            "Electronics", "Electronic devices and components"
-        )
-        office_id = inventory_system.category_manager.add_category(
-            "Office Supplies", "Office stationery and supplies"
-        )
+        # One transaction for the whole demo setup: a single commit
+        # instead of an fsync per insert
+        with inventory_system.db_manager.transaction():
+            # Add some categories
+            electronics_id = inventory_system.category_manager.add_category(
+                "Electronics", "Electronic devices and components"
+            )
+            office_id = inventory_system.category_manager.add_category(
+                "Office Supplies", "Office stationery and supplies"
+            )
         
-        # Add a supplier
-        supplier_id = inventory_system.supplier_manager.add_supplier(
-            "Tech Supplies Inc.", "John Doe", "john@techsupplies.com", "555-1234", "123 Tech St."
-        )
+            # Add a supplier
+            supplier_id = inventory_system.supplier_manager.add_supplier(
+                "Tech Supplies Inc.", "John Doe", "john@techsupplies.com", "555-1234", "123 Tech St."
+            )
         
-        # Add locations
-        warehouse_id = inventory_system.location_manager.add_location(
-            "Main Warehouse", "Main storage facility"
-        )
-        store_id = inventory_system.location_manager.add_location(
-            "Retail Store", "Customer-facing store"
-        )
+            # Add locations
+            warehouse_id = inventory_system.location_manager.add_location(
+                "Main Warehouse", "Main storage facility"
+            )
+            store_id = inventory_system.location_manager.add_location(
+                "Retail Store", "Customer-facing store"
+            )
         
-        # Add products
-        laptop = Product(
-            sku="TECH-001",
-            name="Laptop Computer",
-            description="High-performance laptop",
-            category_id=electronics_id,
-            supplier_id=supplier_id,
-            unit_price=999.99,
-            min_stock_level=5,
-            max_stock_level=20
-        )
-        laptop_id = inventory_system.product_manager.add_product(laptop)
+            # Add products
+            laptop = Product(
+                sku="TECH-001",
+                name="Laptop Computer",
+                description="High-performance laptop",
+                category_id=electronics_id,
+                supplier_id=supplier_id,
+                unit_price=999.99,
+                min_stock_level=5,
+                max_stock_level=20
+            )
+            laptop_id = inventory_system.product_manager.add_product(laptop)
         
-        paper = Product(
-            sku="OFF-001",
-            name="Printer Paper",
-            description="A4 printer paper, 500 sheets",
-            category_id=office_id,
-            supplier_id=supplier_id,
-            unit_price=4.99,
-            min_stock_level=10,
-            max_stock_level=100
-        )
-        paper_id = inventory_system.product_manager.add_product(paper)
+            paper = Product(
+                sku="OFF-001",
+                name="Printer Paper",
+                description="A4 printer paper, 500 sheets",
+                category_id=office_id,
+                supplier_id=supplier_id,
+                unit_price=4.99,
+                min_stock_level=10,
+                max_stock_level=100
+            )
+            paper_id = inventory_system.product_manager.add_product(paper)
         
-        # Record inventory transactions
-        # Initial stock receipt for laptops
-        laptop_receipt = InventoryTransaction(
-            product_id=laptop_id,
-            location_id=warehouse_id,
-            transaction_type_id=1,  # Purchase
-            quantity=10,
-            reference_number="PO-12345",
-            notes="Initial stock",
-            created_by="System"
-        )
-        inventory_system.inventory_manager.record_transaction(laptop_receipt)
+            # Record inventory transactions
+            # Initial stock receipt for laptops
+            laptop_receipt = InventoryTransaction(
+                product_id=laptop_id,
+                location_id=warehouse_id,
+                transaction_type_id=1,  # Purchase
+                quantity=10,
+                reference_number="PO-12345",
+                notes="Initial stock",
+                created_by="System"
+            )
+            inventory_system.inventory_manager.record_transaction(laptop_receipt)
         
-        # Initial stock receipt for paper
-        paper_receipt = InventoryTransaction(
-            product_id=paper_id,
-            location_id=warehouse_id,
-            transaction_type_id=1,  # Purchase
-            quantity=50,
-            reference_number="PO-12345",
-            notes="Initial stock",
-            created_by="System"
-        )
-        inventory_system.inventory_manager.record_transaction(paper_receipt)
+            # Initial stock receipt for paper
+            paper_receipt = InventoryTransaction(
+                product_id=paper_id,
+                location_id=warehouse_id,
+                transaction_type_id=1,  # Purchase
+                quantity=50,
+                reference_number="PO-12345",
+                notes="Initial stock",
+                created_by="System"
+            )
+            inventory_system.inventory_manager.record_transaction(paper_receipt)
         
-        # Transfer some laptops to the store
-        laptop_transfer = InventoryTransaction(
-            product_id=laptop_id,
-            location_id=warehouse_id,
-            transaction_type_id=5,  # Transfer Out
-            quantity=3,
-            reference_number="TRF-001",
-            notes="Transfer to store",
-            created_by="System"
-        )
-        inventory_system.inventory_manager.record_transaction(laptop_transfer)
+            # Transfer some laptops to the store
+            laptop_transfer = InventoryTransaction(
+                product_id=laptop_id,
+                location_id=warehouse_id,
+                transaction_type_id=5,  # Transfer Out
+                quantity=3,
+                reference_number="TRF-001",
+                notes="Transfer to store",
+                created_by="System"
+            )
+            inventory_system.inventory_manager.record_transaction(laptop_transfer)
         
-        laptop_receive = InventoryTransaction(
-            product_id=laptop_id,
-            location_id=store_id,
-            transaction_type_id=4,  # Transfer In
-            quantity=3,
-            reference_number="TRF-001",
-            notes="Transfer from warehouse",
-            created_by="System"
-        )
-        inventory_system.inventory_manager.record_transaction(laptop_receive)
+            laptop_receive = InventoryTransaction(
+                product_id=laptop_id,
+                location_id=store_id,
+                transaction_type_id=4,  # Transfer In
+                quantity=3,
+                reference_number="TRF-001",
+                notes="Transfer from warehouse",
+                created_by="System"
+            )
+            inventory_system.inventory_manager.record_transaction(laptop_receive)
         
-        # Sell a laptop
-        laptop_sale = InventoryTransaction(
-            product_id=laptop_id,
-            location_id=store_id,
-            transaction_type_id=2,  # Sale
-            quantity=1,
-            reference_number="SALE-001",
-            notes="Customer purchase",
-            created_by="System"
-        )
-        inventory_system.inventory_manager.record_transaction(laptop_sale)
+            # Sell a laptop
+            laptop_sale = InventoryTransaction(
+                product_id=laptop_id,
+                location_id=store_id,
+                transaction_type_id=2,  # Sale
+                quantity=1,
+                reference_number="SALE-001",
+                notes="Customer purchase",
+                created_by="System"
+            )
+            inventory_system.inventory_manager.record_transaction(laptop_sale)
         
         # Check current inventory levels
         inventory_levels = inventory_system.inventory_manager.get_inventory_levels()